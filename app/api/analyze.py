@@ -14,45 +14,68 @@ import logging
 import time
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Request, status
-from pydantic import BaseModel, Field
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 
+from app.core.limits import ANALYZE_RATE_LIMIT, limiter
 from app.schemas.analysis import AnalyzeRequest
-from app.services.analyzer import create_analyzer
+from app.services.analyzer import MessageAnalyzer, create_analyzer
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Error payload is constant, so serialize it once at import
+_SERVICE_UNAVAILABLE_BODY = orjson.dumps(
+    {
+        "success": False,
+        "error": "service_unavailable",
+        "message": "Analysis service is temporarily unavailable",
+        "details": {"reason": "LLM service initialization failed"},
+    }
+)
 
-# Helper to get limiter from app state at runtime
-def _get_limiter():
-    """
-    Get rate limiter from app state.
 
-    Falls back to in-memory limiter if app not available (e.g., during testing).
-    """
-    try:
-        from app.main import app
+def _service_unavailable() -> Response:
+    """Build 503 response from the pre-serialized body."""
+    return Response(
+        content=_SERVICE_UNAVAILABLE_BODY,
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        media_type="application/json",
+    )
 
-        return app.state.limiter
-    except (ImportError, AttributeError):
-        # Fallback for testing or if app not yet initialized
-        return Limiter(key_func=get_remote_address)
 
+def _internal_error(message: str, error: Exception) -> ORJSONResponse:
+    """Build 500 response directly, bypassing the HTTPException handler."""
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={
+            "success": False,
+            "error": "internal_error",
+            "message": message,
+            "details": {"error_type": type(error).__name__},
+        },
+    )
 
-def _rate_limit(limit_spec: str = "60/minute"):
+
+def _get_analyzer(request: Request) -> MessageAnalyzer:
     """
-    Decorator factory for rate limiting endpoints.
+    Get the shared analyzer from app state.
 
-    Args:
-        limit_spec: Rate limit specification (e.g., "60/minute")
+    The analyzer (and its LLM client) is built once at startup by the
+    lifespan handler. If startup could not build it (e.g. missing API key
+    in development), it is created lazily on first use and cached so later
+    requests skip client construction.
 
-    Returns:
-        Rate limit decorator using app's configured limiter
+    Raises:
+        Exception: Propagates analyzer construction errors
     """
-    return _get_limiter().limit(limit_spec)
+    analyzer: MessageAnalyzer | None = getattr(request.app.state, "analyzer", None)
+    if analyzer is None:
+        analyzer = create_analyzer()
+        request.app.state.analyzer = analyzer
+    return analyzer
 
 
 class AnalysisResponseEnvelope(BaseModel):
@@ -67,9 +90,13 @@ class AnalysisResponseEnvelope(BaseModel):
     sanitization: dict[str, Any] = Field(..., description="Input sanitization details")
     processing_time_ms: float = Field(..., description="Total processing time in milliseconds")
     llm_used: bool = Field(..., description="Whether LLM was used (vs fallback)")
+    cached: bool = Field(
+        default=False, description="Whether the result was served from the analysis cache"
+    )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "success": True,
                 "analysis": {
@@ -86,8 +113,10 @@ class AnalysisResponseEnvelope(BaseModel):
                 },
                 "processing_time_ms": 1234.56,
                 "llm_used": True,
+                "cached": False,
             }
-        }
+        },
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -98,15 +127,17 @@ class ErrorResponse(BaseModel):
     message: str = Field(..., description="Human-readable error message")
     details: dict[str, Any] | None = Field(default=None, description="Additional error details")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "success": False,
                 "error": "validation_error",
                 "message": "Message is too long",
                 "details": {"field": "message", "max_length": 10000},
             }
-        }
+        },
+    )
 
 
 @router.post(
@@ -125,10 +156,10 @@ class ErrorResponse(BaseModel):
     },
     tags=["Analysis"],
 )
-@_rate_limit("60/minute")  # Use centralized rate limiter
+@limiter.limit(ANALYZE_RATE_LIMIT)
 async def analyze_message(
     request: Request, analyze_request: AnalyzeRequest
-) -> AnalysisResponseEnvelope:
+) -> AnalysisResponseEnvelope | Response:
     """
     Analyze a message for sentiment, emotion, and stress level.
 
@@ -138,42 +169,59 @@ async def analyze_message(
     3. Uses LLM to analyze sentiment, emotion, stress
     4. Returns structured analysis with confidence scores
 
-    **Rate Limit:** 60 requests per minute per IP address
+    **Rate Limit:** RATE_LIMIT_PER_MINUTE requests per minute per IP address (default 60)
 
     Args:
         request: FastAPI request object (for rate limiting)
         analyze_request: Message to analyze with optional metadata
 
     Returns:
-        AnalysisResponseEnvelope with analysis results and metadata
+        AnalysisResponseEnvelope with analysis results and metadata,
+        or a 500/503 error response
 
     Raises:
-        HTTPException: 400, 422, 429, 500, or 503 for various error conditions
+        HTTPException: 400, 422, or 429 for request errors
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
 
     try:
-        # Create analyzer (with LLM client)
+        # Serve repeated messages from the result cache without calling the LLM
+        cache = getattr(request.app.state, "analysis_cache", None)
+        cache_key = cache.make_key(analyze_request) if cache is not None else None
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None:
+            processing_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            logger.info("Analysis cache hit: time=%.2fms", processing_time_ms)
+            return AnalysisResponseEnvelope(
+                success=True,
+                analysis=cached.analysis,
+                sanitization={
+                    "is_safe": cached.threat_level != "critical",
+                    "threat_level": cached.threat_level,
+                    "modifications_made": [] if not cached.sanitization_applied else ["sanitized"],
+                },
+                processing_time_ms=round(processing_time_ms, 2),
+                llm_used=cached.llm_used,
+                cached=True,
+            )
+
+        # Get shared analyzer (with LLM client)
         try:
-            analyzer = create_analyzer()
+            analyzer = _get_analyzer(request)
         except Exception as e:
-            logger.error(f"Failed to initialize analyzer: {type(e).__name__}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail={
-                    "success": False,
-                    "error": "service_unavailable",
-                    "message": "Analysis service is temporarily unavailable",
-                    "details": {"reason": "LLM service initialization failed"},
-                },
-            ) from e
+            logger.error("Failed to initialize analyzer: %s", type(e).__name__)
+            return _service_unavailable()
 
-        # Perform analysis
+        # Perform analysis (micro-batched when batching is enabled)
+        batcher = getattr(request.app.state, "batcher", None)
         try:
-            result = analyzer.analyze(analyze_request)
+            if batcher is not None:
+                result = await batcher.submit(analyze_request)
+            else:
+                result = await analyzer.analyze_async(analyze_request)
         except ValueError as e:
             # Validation or parsing errors
-            logger.warning(f"Analysis validation error: {str(e)}")
+            logger.warning("Analysis validation error: %s", type(e).__name__)
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail={
@@ -185,19 +233,16 @@ async def analyze_message(
             ) from e
         except Exception as e:
             # Unexpected errors
-            logger.error(f"Analysis failed: {type(e).__name__}: {str(e)}", exc_info=True)
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail={
-                    "success": False,
-                    "error": "internal_error",
-                    "message": "An unexpected error occurred during analysis",
-                    "details": {"error_type": type(e).__name__},
-                },
-            ) from e
+            logger.error("Analysis failed: %s", type(e).__name__)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Analysis failure traceback", exc_info=True)
+            return _internal_error("An unexpected error occurred during analysis", e)
+
+        if cache is not None:
+            cache.set(cache_key, result)
 
         # Calculate total processing time
-        processing_time_ms = (time.time() - start_time) * 1000
+        processing_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
         # Extract analysis result
         analysis_dict = result.analysis
@@ -219,13 +264,18 @@ async def analyze_message(
         )
 
         # Log successful analysis (metadata only, no user content)
-        logger.info(
-            f"Analysis completed: "
-            f"sentiment={analysis_dict.get('sentiment')}, "
-            f"stress={analysis_dict.get('stress_score')}, "
-            f"llm_used={llm_used}, "
-            f"time={processing_time_ms:.2f}ms"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Analysis completed: sentiment=%(sentiment)s, stress=%(stress)s, "
+                "llm_used=%(llm_used)s, time=%(time_ms).2fms",
+                {
+                    "event": "analysis_completed",
+                    "sentiment": analysis_dict.get("sentiment"),
+                    "stress": analysis_dict.get("stress_score"),
+                    "llm_used": llm_used,
+                    "time_ms": processing_time_ms,
+                },
+            )
 
         return response
 
@@ -234,13 +284,7 @@ async def analyze_message(
         raise
     except Exception as e:
         # Catch-all for unexpected errors
-        logger.error(f"Unhandled error in analyze endpoint: {type(e).__name__}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={
-                "success": False,
-                "error": "internal_error",
-                "message": "An unexpected error occurred",
-                "details": {"error_type": type(e).__name__},
-            },
-        ) from e
+        logger.error("Unhandled error in analyze endpoint: %s", type(e).__name__)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Unhandled error traceback", exc_info=True)
+        return _internal_error("An unexpected error occurred", e)
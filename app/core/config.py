@@ -17,9 +17,10 @@ Version: 1.0.0
 """
 
 import os
+from functools import cached_property, lru_cache
 
 from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -32,6 +33,16 @@ class Settings(BaseSettings):
     3. Default values
     """
 
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        # Allow extra fields for forward compatibility
+        extra="ignore",
+        # Shared singleton via get_settings(): make it immutable and hashable
+        frozen=True,
+    )
+
     # Application Info
     app_name: str = "Zoho Feedback Analyzer API"
     app_version: str = "1.0.0"
@@ -48,13 +59,21 @@ class Settings(BaseSettings):
     llm_temperature: float = Field(default=0.3, alias="LLM_TEMPERATURE")
     llm_max_tokens: int = Field(default=2048, alias="LLM_MAX_TOKENS")
     llm_timeout: int = Field(default=30, alias="LLM_TIMEOUT")
+    llm_warmup_enabled: bool = Field(default=True, alias="LLM_WARMUP_ENABLED")
+    llm_warmup_timeout: float = Field(default=5.0, alias="LLM_WARMUP_TIMEOUT")  # seconds
 
     # API Rate Limiting
     # WARNING: memory:// storage does NOT work with multiple workers!
-    # In production with multiple workers, use Redis: "redis://localhost:6379/0"
+    # Unset storage defaults to memory:// in development and Redis in production
     rate_limit_enabled: bool = Field(default=True, alias="RATE_LIMIT_ENABLED")
     rate_limit_per_minute: int = Field(default=60, alias="RATE_LIMIT_PER_MINUTE")
-    rate_limit_storage_uri: str = Field(default="memory://", alias="RATE_LIMIT_STORAGE")
+    rate_limit_storage_uri: str | None = Field(
+        default=None, alias="RATE_LIMIT_STORAGE", validate_default=True
+    )
+    rate_limit_strategy: str = Field(default="moving-window", alias="RATE_LIMIT_STRATEGY")
+    rate_limit_redis_max_connections: int = Field(
+        default=64, alias="RATE_LIMIT_REDIS_MAX_CONNECTIONS"
+    )
 
     # CORS Configuration
     cors_enabled: bool = Field(default=True, alias="CORS_ENABLED")
@@ -78,6 +97,12 @@ class Settings(BaseSettings):
 
     # Feature Flags
     batch_analysis_enabled: bool = Field(default=False, alias="BATCH_ANALYSIS_ENABLED")
+    batch_max_size: int = Field(default=16, alias="BATCH_MAX_SIZE")
+    batch_max_wait_ms: float = Field(default=10.0, alias="BATCH_MAX_WAIT_MS")
+    batch_max_concurrency: int = Field(default=4, alias="BATCH_MAX_CONCURRENCY")
+    analysis_cache_enabled: bool = Field(default=True, alias="ANALYSIS_CACHE_ENABLED")
+    analysis_cache_max_size: int = Field(default=1024, alias="ANALYSIS_CACHE_MAX_SIZE")
+    analysis_cache_ttl_seconds: float = Field(default=900.0, alias="ANALYSIS_CACHE_TTL_SECONDS")
     async_processing_enabled: bool = Field(default=False, alias="ASYNC_PROCESSING_ENABLED")
 
     @field_validator("cors_origins", mode="before")
@@ -116,6 +141,16 @@ class Settings(BaseSettings):
             raise ValueError("Rate limit must be positive")
         return v
 
+    @field_validator("rate_limit_storage_uri", mode="after")
+    @classmethod
+    def default_rate_limit_storage(cls, v, info):
+        """Default to shared Redis storage in production, in-memory otherwise"""
+        if v:
+            return v
+        if info.data.get("environment") == "production":
+            return "redis://localhost:6379/0"
+        return "memory://"
+
     @field_validator("gemini_api_key", mode="after")
     @classmethod
     def validate_gemini_api_key_in_production(cls, v):
@@ -125,6 +160,11 @@ class Settings(BaseSettings):
             raise ValueError("GEMINI_API_KEY is required in production environment")
         return v
 
+    @cached_property
+    def cors_origin_set(self) -> frozenset[str]:
+        """CORS origins as a frozenset for O(1) membership checks"""
+        return frozenset(self.cors_origins)
+
     @property
     def is_development(self) -> bool:
         """Check if running in development mode"""
@@ -135,20 +175,8 @@ class Settings(BaseSettings):
         """Check if running in production mode"""
         return self.environment == "production"
 
-    class Config:
-        """Pydantic settings configuration"""
-
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
-        # Allow extra fields for forward compatibility
-        extra = "ignore"
-
-
-# Global settings instance
-_settings: Settings | None = None
-
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get application settings singleton.
@@ -162,10 +190,7 @@ def get_settings() -> Settings:
     Raises:
         ValidationError: If required settings are missing or invalid
     """
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    return Settings()
 
 
 def reload_settings() -> Settings:
@@ -177,8 +202,7 @@ def reload_settings() -> Settings:
     Returns:
         Fresh Settings instance
     """
-    global _settings
-    _settings = None
+    get_settings.cache_clear()
     return get_settings()
 
 
@@ -0,0 +1,29 @@
+"""
+Shared rate limiter.
+
+A single slowapi Limiter is created at import time so route decorators
+bind to a stable instance and the FastAPI app can attach the same object
+to app.state.limiter.
+
+Version: 1.0.0
+"""
+
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from app.core.config import get_settings
+
+_settings = get_settings()
+
+# Moving-window checks run as a single Lua script on Redis; the pool size
+# caps connections shared by all requests in this worker.
+limiter = Limiter(
+    key_func=get_remote_address,
+    enabled=_settings.rate_limit_enabled,
+    storage_uri=_settings.rate_limit_storage_uri,
+    strategy=_settings.rate_limit_strategy,
+    storage_options={"max_connections": _settings.rate_limit_redis_max_connections},
+)
+
+# Per-client limit for POST /analyze, resolved once at import
+ANALYZE_RATE_LIMIT = f"{_settings.rate_limit_per_minute}/minute"
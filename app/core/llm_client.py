@@ -13,39 +13,234 @@ Provider: Gemini ONLY (gemini-2.0-pro or gemini-2.0-flash)
 Version: 1.0.0
 """
 
+import asyncio
+import copy
+import hashlib
 import json
 import logging
 import os
 import re
 import socket
+import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
 import google.generativeai as genai
+import orjson
+from google.api_core.exceptions import (
+    DeadlineExceeded,
+    InternalServerError,
+    ResourceExhausted,
+    ServiceUnavailable,
+)
+from google.generativeai import client as genai_client
 from google.generativeai.types import GenerationConfig, HarmBlockThreshold, HarmCategory
+from pydantic import ValidationError
 from requests.exceptions import ConnectionError as RequestsConnectionError
 from requests.exceptions import Timeout as RequestsTimeout
 from tenacity import (
+    AsyncRetrying,
+    Retrying,
     before_sleep_log,
-    retry,
     retry_if_exception_type,
     stop_after_attempt,
-    wait_exponential,
+    wait_exponential_jitter,
 )
 
+from app.core.semantic_cache import SemanticCache
+from app.core.sqlite_cache import SQLiteCache
+from app.core.ttl_cache import TTLCache
 from app.schemas.analysis import AnalyzeResponse
 
 logger = logging.getLogger(__name__)
 
 
-# Gemini API error types that should trigger retry (network/timeout only)
+# Gemini API error types that should trigger retry (transient failures only)
 RETRIABLE_ERRORS = (
     RequestsTimeout,
     RequestsConnectionError,
     socket.timeout,
-    # Add SDK-specific transient exceptions here if present, e.g. genai.TransportError
+    # gRPC transport surfaces these instead
+    DeadlineExceeded,
+    ServiceUnavailable,
+    InternalServerError,  # 500
+    ResourceExhausted,  # 429 quota / rate limit
+)
+
+# Response cleanup patterns, compiled once (run on every Gemini response)
+_FENCE_OPEN_RE = re.compile(r"^```(?:json)?\s*", re.IGNORECASE)
+# One pass over a JSON body: whole string literals (kept as-is), trailing
+# commas before } or ] (dropped), and braces (counted for truncation repair)
+_JSON_CLEAN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|,\s*(?=[}\]])|[{}]')
+
+
+# Role header for each prompt turn (messages with other roles are dropped)
+_ROLE_HEADERS = {
+    "system": "SYSTEM INSTRUCTIONS:\n",
+    "user": "USER:\n",
+    "assistant": "ASSISTANT:\n",
+}
+
+
+@lru_cache(maxsize=32)
+def _format_prefix(turns: tuple[tuple[str, str], ...]) -> str:
+    """Format the leading (header, content) turns of a prompt, memoized."""
+    return "".join(f"{header}{content}\n\n" for header, content in turns)
+
+
+# Fixed fields of the neutral fallback response (see _generate_fallback_response)
+_FALLBACK_TEMPLATE: Mapping[str, Any] = MappingProxyType(
+    {
+        "sentiment": "neutral",
+        "emotion": "neutral",
+        "stress_score": 5,
+        "category": "general",
+        "suggested_reply": "Thank you for your message. Let me review this and get back to you.",
+        "urgency": False,
+    }
 )
+_FALLBACK_ACTION_ITEMS = ("Review message", "Follow up with sender")
+_FALLBACK_CONFIDENCE: Mapping[str, float] = MappingProxyType(
+    {"sentiment": 0.5, "emotion": 0.5, "category": 0.5, "stress": 0.5}
+)
+
+
+def _clean_json_body(body: str) -> tuple[str, int]:
+    """
+    Drop trailing commas outside string literals and count unclosed braces.
+
+    Returns:
+        (cleaned body, number of "{" without a matching "}")
+    """
+    unclosed = 0
+
+    def _token(match: re.Match[str]) -> str:
+        nonlocal unclosed
+        token = match.group()
+        if token == "{":
+            unclosed += 1
+        elif token == "}":
+            unclosed -= 1
+        elif token[0] == ",":
+            return ""
+        return token
+
+    return _JSON_CLEAN_RE.sub(_token, body), unclosed
+
+
+# genai.configure() is process-global; only reconfigure when the key changes
+_configured_api_key: str | None = None
+
+
+def _configure_sdk(api_key: str) -> None:
+    """Point the SDK's default clients at api_key (no-op if already)."""
+    global _configured_api_key
+    if api_key != _configured_api_key:
+        genai.configure(api_key=api_key)
+        _configured_api_key = api_key
+
+
+def _reset_sdk_state() -> None:
+    """Forget the configured key and shared models, so new clients start fresh."""
+    global _configured_api_key
+    _configured_api_key = None
+    _get_model.cache_clear()
+
+
+@lru_cache(maxsize=32)
+def _get_model(
+    model_name: str, temperature: float, max_tokens: int, api_key_hash: str
+) -> genai.GenerativeModel:
+    """
+    Build the GenerativeModel for a configuration, shared by all clients.
+
+    Call only after _configure_sdk() for the same key. The model is pinned
+    to that key's default transports when built; otherwise it would bind
+    lazily to whatever key genai.configure() set last. The API key is part
+    of the cache key (as a hash), so clients for different keys never share
+    a model. The async transport is bound to the running event loop, so
+    build clients inside the loop that will use them.
+    """
+    model = genai.GenerativeModel(
+        model_name=model_name,
+        generation_config=GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+            response_mime_type="application/json",  # Force JSON output
+        ),
+        # Safety settings - allow all content for workplace analysis
+        safety_settings={
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+        },
+    )
+    model._client = genai_client.get_default_generative_client()
+    model._async_client = genai_client.get_default_generative_async_client()
+    return model
+
+
+class _StreamingFieldParser:
+    """
+    Extract completed top-level fields from a JSON object as it streams in.
+
+    Tolerates a leading code fence. A value is only reported once the
+    token after it has arrived, so numbers split across chunks are never
+    reported truncated.
+    """
+
+    _WHITESPACE = " \t\r\n"
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos: int | None = None  # next unparsed index inside the object
+        self._decoder = json.JSONDecoder()
+
+    @staticmethod
+    def _skip(text: str, pos: int, chars: str) -> int:
+        while pos < len(text) and text[pos] in chars:
+            pos += 1
+        return pos
+
+    def feed(self, text: str) -> dict[str, Any]:
+        """Append text; return the top-level fields completed by it."""
+        self.buffer += text
+        fields: dict[str, Any] = {}
+
+        if self._pos is None:
+            start = self.buffer.find("{")
+            if start < 0:
+                return fields
+            self._pos = start + 1
+
+        buf = self.buffer
+        while True:
+            pos = self._skip(buf, self._pos, self._WHITESPACE + ",")
+            if pos >= len(buf) or buf[pos] != '"':
+                return fields  # need more input, or end of object
+
+            try:
+                key, pos = self._decoder.raw_decode(buf, pos)
+                pos = self._skip(buf, pos, self._WHITESPACE)
+                if pos >= len(buf) or buf[pos] != ":":
+                    return fields
+                pos = self._skip(buf, pos + 1, self._WHITESPACE)
+                value, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                return fields
+
+            after = self._skip(buf, end, self._WHITESPACE)
+            if after >= len(buf):
+                return fields
+
+            fields[key] = value
+            self._pos = after
 
 
 @dataclass
@@ -60,6 +255,14 @@ class LLMConfig:
     max_retries: int = 3
     retry_min_wait: int = 1  # seconds
     retry_max_wait: int = 10  # seconds
+    max_concurrency: int = 8  # in-flight calls for aanalyze_concurrent
+    max_requests_per_minute: int | None = None  # client-side RPM cap (None = off)
+    response_cache_size: int = 256  # exact-match prompt cache entries (0 = off)
+    response_cache_ttl_seconds: float = 900.0
+    response_cache_path: str | None = None  # SQLite file shared across workers (None = memory)
+    semantic_cache_threshold: float | None = None  # cosine similarity (None = off)
+    semantic_cache_max_size: int = 40_000  # stop adding entries here
+    semantic_cache_quantize_after: int | None = 10_000  # int8 index from here (None = never)
 
 
 class GeminiClient:
@@ -83,29 +286,57 @@ class GeminiClient:
         """
         self.config = config
 
-        # Configure Gemini API
-        genai.configure(api_key=config.api_key)
-
-        # Initialize model
-        self.model = genai.GenerativeModel(
-            model_name=config.model_name,
-            generation_config=GenerationConfig(
-                temperature=config.temperature,
-                max_output_tokens=config.max_tokens,
-                response_mime_type="application/json",  # Force JSON output
-            ),
-            # Safety settings - allow all content for workplace analysis
-            safety_settings={
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-            },
+        # Start times of recent async calls, for the optional RPM cap
+        self._request_times: deque[float] = deque()
+
+        # Responses that failed a direct parse (fenced or malformed JSON)
+        self.slow_path_parses = 0
+
+        # Async calls in flight, keyed like the response cache
+        self._inflight: dict[str, asyncio.Future[dict[str, Any]]] = {}
+
+        # Exact-match response cache (disabled when response_cache_size is 0);
+        # with response_cache_path it is a SQLite file shared by all workers
+        self._response_cache: TTLCache[dict[str, Any]] | SQLiteCache | None = None
+        if config.response_cache_size > 0:
+            if config.response_cache_path:
+                self._response_cache = SQLiteCache(
+                    config.response_cache_path,
+                    max_size=config.response_cache_size,
+                    ttl_seconds=config.response_cache_ttl_seconds,
+                )
+            else:
+                self._response_cache = TTLCache(
+                    max_size=config.response_cache_size,
+                    ttl_seconds=config.response_cache_ttl_seconds,
+                )
+
+        # Optional near-duplicate cache (needs sentence-transformers + faiss)
+        self._semantic_cache: SemanticCache | None = None
+        if config.semantic_cache_threshold is not None:
+            try:
+                self._semantic_cache = SemanticCache(
+                    threshold=config.semantic_cache_threshold,
+                    max_size=config.semantic_cache_max_size,
+                    quantize_after=config.semantic_cache_quantize_after,
+                )
+            except ImportError as e:
+                logger.warning("Semantic cache disabled: %s", e)
+
+        # Configure Gemini API and reuse the shared model for this configuration
+        _configure_sdk(config.api_key)
+        self.model = _get_model(
+            config.model_name,
+            config.temperature,
+            config.max_tokens,
+            hashlib.sha256(config.api_key.encode()).hexdigest(),
         )
 
         logger.info(
-            f"Initialized Gemini client: model={config.model_name}, "
-            f"temp={config.temperature}, max_tokens={config.max_tokens}"
+            "Initialized Gemini client: model=%s, temp=%s, max_tokens=%s",
+            config.model_name,
+            config.temperature,
+            config.max_tokens,
         )
 
     def _extract_text_from_response(self, response) -> str:
@@ -123,56 +354,95 @@ class GeminiClient:
         Raises:
             ValueError: If unable to extract text from response
         """
-        # 1) response.text (simple)
-        if hasattr(response, "text"):
+        # 1) response.text (simple) - the current SDK's shape, so checked first.
+        # The SDK property raises ValueError when the response has no parts.
+        try:
             text = response.text
-            if isinstance(text, str) and text.strip():
-                return text.strip()
+        except (AttributeError, ValueError):
+            text = None
+        if isinstance(text, str) and (stripped := text.strip()):
+            return stripped
 
+        return self._extract_text_slow(response)
+
+    @staticmethod
+    def _extract_text_slow(response) -> str:
+        """Extract text from older or unusual SDK response shapes."""
         # 2) response.candidates -> candidate.output or candidate.text
         # Check if candidates exist and are not empty
-        if hasattr(response, "candidates") and response.candidates:
+        candidates = getattr(response, "candidates", None)
+        if candidates:
             try:
-                cand = response.candidates[0]
+                cand = candidates[0]
                 # Some SDKs have .output or .text
-                if hasattr(cand, "output"):
-                    output = cand.output
-                    if isinstance(output, str) and output.strip():
-                        return output.strip()
-                if hasattr(cand, "text"):
-                    text = cand.text
-                    if isinstance(text, str) and text.strip():
-                        return text.strip()
+                for attr in ("output", "text"):
+                    value = getattr(cand, attr, None)
+                    if isinstance(value, str) and value.strip():
+                        return value.strip()
                 # Some SDKs return nested dict
                 if isinstance(cand, dict):
                     for key in ("output", "text", "content"):
                         if key in cand and isinstance(cand[key], str) and cand[key].strip():
                             return cand[key].strip()
             except Exception as e:
-                logger.warning(f"Exception during candidate extraction: {e}")
+                logger.warning("Exception during candidate extraction: %s", e)
 
         # 3) response.output_text or response.output
         for attr in ("output_text", "output", "content"):
-            if hasattr(response, attr):
-                val = getattr(response, attr, None)
-                if isinstance(val, str):
-                    val_str = val.strip()
-                    if val_str:
-                        return val_str
+            val = getattr(response, attr, None)
+            if isinstance(val, str):
+                val_str = val.strip()
+                if val_str:
+                    return val_str
 
         raise ValueError("Unable to extract text from Gemini response object")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type(RETRIABLE_ERRORS),
-        before_sleep=before_sleep_log(logger, logging.WARNING),
-        reraise=True,
-    )
+    def _build_prompt(self, messages: list[dict[str, str]]) -> str:
+        """
+        Convert chat messages to a single Gemini prompt.
+
+        Gemini uses a simpler format: just concatenate with role labels.
+        Everything before the final turn (system prompt, few-shot examples)
+        is the same across requests and is formatted once via _format_prefix.
+        """
+        turns = [
+            (header, msg.get("content", ""))
+            for msg in messages
+            if (header := _ROLE_HEADERS.get(msg.get("role", "user"))) is not None
+        ]
+        if not turns:
+            return ""
+
+        header, content = turns[-1]
+        return f"{_format_prefix(tuple(turns[:-1]))}{header}{content}\n"
+
+    def _response_text(self, response, elapsed: float) -> str:
+        """Log call latency and extract non-empty text from a Gemini response."""
+        # Log success
+        logger.info(
+            "Gemini API call successful: latency=%.2fs, model=%s",
+            elapsed,
+            self.config.model_name,
+        )
+
+        # Extract text from response (handles multiple SDK shapes)
+        try:
+            text = self._extract_text_from_response(response)
+        except Exception as e:
+            logger.error("Failed to extract text from Gemini response: %s", type(e).__name__)
+            raise
+
+        if not text:
+            raise ValueError("Gemini returned empty response text")
+
+        return text
+
     def _make_api_call(self, messages: list[dict[str, str]]) -> str:
         """
         Make API call to Gemini with retry logic.
 
+        Retry attempts and backoff come from LLMConfig, as for async calls.
+
         Args:
             messages: List of message dicts with role and content
 
@@ -182,52 +452,169 @@ class GeminiClient:
         Raises:
             Exception: On API errors after retries exhausted
         """
-        try:
-            # Convert messages to Gemini format
-            # Gemini uses a simpler format: just concatenate with role labels
-            prompt_parts = []
-            for msg in messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-
-                if role == "system":
-                    prompt_parts.append(f"SYSTEM INSTRUCTIONS:\n{content}\n")
-                elif role == "user":
-                    prompt_parts.append(f"USER:\n{content}\n")
-                elif role == "assistant":
-                    prompt_parts.append(f"ASSISTANT:\n{content}\n")
-
-            full_prompt = "\n".join(prompt_parts)
-
-            # Make API call with timeout
-            start_time = time.time()
-            response = self.model.generate_content(
-                full_prompt, request_options={"timeout": self.config.timeout_seconds}
-            )
-            elapsed = time.time() - start_time
+        full_prompt = self._build_prompt(messages)
 
-            # Log success
-            logger.info(
-                f"Gemini API call successful: "
-                f"latency={elapsed:.2f}s, "
-                f"model={self.config.model_name}"
-            )
+        for attempt in Retrying(**self._retry_policy()):
+            with attempt:
+                try:
+                    # Make API call with timeout
+                    start_time = time.time()
+                    response = self.model.generate_content(
+                        full_prompt, request_options={"timeout": self.config.timeout_seconds}
+                    )
+                    return self._response_text(response, time.time() - start_time)
+
+                except Exception as e:
+                    logger.error(
+                        "Gemini API call failed: %s (no user content logged)", type(e).__name__
+                    )
+                    raise
+
+        raise AssertionError("unreachable: Retrying reraises on exhaustion")
+
+    async def _amake_api_call(self, messages: list[dict[str, str]]) -> str:
+        """
+        Make non-blocking API call to Gemini with retry logic.
 
-            # Extract text from response (handles multiple SDK shapes)
-            try:
-                text = self._extract_text_from_response(response)
-            except Exception as e:
-                logger.error("Failed to extract text from Gemini response: %s", type(e).__name__)
-                raise
+        Async counterpart of _make_api_call using the SDK's async transport,
+        so the event loop keeps serving other requests during the round-trip.
+        Retry attempts and backoff come from LLMConfig.
 
-            if not text:
-                raise ValueError("Gemini returned empty response text")
+        Args:
+            messages: List of message dicts with role and content
 
-            return text
+        Returns:
+            Raw response text from Gemini
+
+        Raises:
+            Exception: On API errors after retries exhausted
+        """
+        full_prompt = self._build_prompt(messages)
+
+        async for attempt in self._async_retrying():
+            with attempt:
+                await self._throttle()
+                try:
+                    start_time = time.time()
+                    response = await self.model.generate_content_async(
+                        full_prompt, request_options={"timeout": self.config.timeout_seconds}
+                    )
+                    return self._response_text(response, time.time() - start_time)
+
+                except Exception as e:
+                    logger.error(
+                        "Gemini API call failed: %s (no user content logged)", type(e).__name__
+                    )
+                    raise
+
+        raise AssertionError("unreachable: AsyncRetrying reraises on exhaustion")
+
+    def _retry_policy(self) -> dict[str, Any]:
+        """Retry settings shared by sync and async calls, driven by LLMConfig."""
+        return {
+            "stop": stop_after_attempt(self.config.max_retries),
+            # Jitter keeps concurrent requests from retrying in lockstep after a 429
+            "wait": wait_exponential_jitter(
+                initial=self.config.retry_min_wait, max=self.config.retry_max_wait
+            ),
+            "retry": retry_if_exception_type(RETRIABLE_ERRORS),
+            "before_sleep": before_sleep_log(logger, logging.WARNING),
+            "reraise": True,
+        }
+
+    def _async_retrying(self) -> AsyncRetrying:
+        """Retry policy for async calls, driven by LLMConfig."""
+        return AsyncRetrying(**self._retry_policy())
+
+    async def _aopen_stream(self, messages: list[dict[str, str]]):
+        """
+        Start a streamed Gemini call with retry logic.
+
+        The SDK resolves the call once the first chunk has arrived, so
+        connection and quota errors are retried here; errors mid-stream
+        are not.
 
+        Returns:
+            Async iterable of response chunks
+        """
+        full_prompt = self._build_prompt(messages)
+
+        async for attempt in self._async_retrying():
+            with attempt:
+                await self._throttle()
+                try:
+                    start_time = time.time()
+                    response = await self.model.generate_content_async(
+                        full_prompt,
+                        stream=True,
+                        request_options={"timeout": self.config.timeout_seconds},
+                    )
+                    logger.info(
+                        "Gemini stream opened: latency=%.2fs, model=%s",
+                        time.time() - start_time,
+                        self.config.model_name,
+                    )
+                    return response
+
+                except Exception as e:
+                    logger.error(
+                        "Gemini API call failed: %s (no user content logged)", type(e).__name__
+                    )
+                    raise
+
+        raise AssertionError("unreachable: AsyncRetrying reraises on exhaustion")
+
+    async def _throttle(self) -> None:
+        """Wait until a call fits under max_requests_per_minute (if set)."""
+        limit = self.config.max_requests_per_minute
+        if not limit:
+            return
+
+        while True:
+            now = time.monotonic()
+            while self._request_times and now - self._request_times[0] >= 60:
+                self._request_times.popleft()
+            if len(self._request_times) < limit:
+                self._request_times.append(now)
+                return
+            await asyncio.sleep(60 - (now - self._request_times[0]))
+
+    async def warmup(self, timeout: float = 5.0) -> bool:
+        """
+        Pre-establish the connection to the Gemini endpoint.
+
+        Issues a cheap count_tokens request over the same async transport
+        used by aanalyze(), so the first real request doesn't pay the
+        connection and TLS handshake cost.
+
+        Args:
+            timeout: Timeout for the warmup request in seconds
+
+        Returns:
+            True if the warmup request succeeded
+        """
+        try:
+            await self.model.count_tokens_async("ping", request_options={"timeout": timeout})
         except Exception as e:
-            logger.error("Gemini API call failed: %s (no user content logged)", type(e).__name__)
-            raise
+            logger.warning("Gemini warmup failed: %s", type(e).__name__)
+            return False
+
+        logger.info("Gemini connection warmed up")
+        return True
+
+    async def aclose(self) -> None:
+        """
+        Release the client on application shutdown (and close the on-disk cache).
+
+        The SDK's transports are process-wide defaults that other clients
+        may still be using, so they are not closed here. Instead the shared
+        SDK state is reset: the next client configures the SDK afresh and
+        gets new transports (bound to its own event loop) rather than ones
+        left over from this client's lifespan.
+        """
+        _reset_sdk_state()
+        if isinstance(self._response_cache, SQLiteCache):
+            self._response_cache.close()
 
     def _strip_code_fences(self, text: str) -> str:
         """
@@ -243,19 +630,15 @@ class GeminiClient:
             Cleaned text without code fences
         """
         text = text.strip()
+        if not text.startswith("```"):
+            return text
 
-        # Remove ```json ... ```
-        if text.startswith("```json"):
-            text = text[7:]  # Remove ```json
-            if text.endswith("```"):
-                text = text[:-3]  # Remove ```
-            text = text.strip()
-
-        # Remove ``` ... ```
-        elif text.startswith("```"):
-            text = text[3:]  # Remove ```
+        # Remove ```json ... ``` or ``` ... ```
+        match = _FENCE_OPEN_RE.match(text)
+        if match:
+            text = text[match.end() :]
             if text.endswith("```"):
-                text = text[:-3]  # Remove ```
+                text = text[:-3]
             text = text.strip()
 
         return text
@@ -274,8 +657,9 @@ class GeminiClient:
             ValueError: If validation fails
         """
         try:
-            # Validate using Pydantic model
-            response = AnalyzeResponse(**data)
+            # Validate using Pydantic model (model_validate goes straight to the
+            # compiled validator, without building a kwargs dict)
+            response = AnalyzeResponse.model_validate(data)
 
             # Convert back to dict (ensures all transformations applied)
             validated_dict: dict[str, Any] = response.model_dump()
@@ -284,8 +668,8 @@ class GeminiClient:
             return validated_dict
 
         except Exception as e:
-            logger.error(f"Response validation failed: {str(e)}")
-            raise ValueError(f"Invalid response structure: {str(e)}") from e
+            logger.error("Response validation failed: %s", e)
+            raise ValueError(f"Invalid response structure: {e}") from e
 
     def _attempt_json_repair(self, text: str) -> dict[str, Any] | None:
         """
@@ -296,7 +680,8 @@ class GeminiClient:
         - Trailing commas
         - Truncated responses (missing closing braces)
 
-        Uses regex to avoid corrupting quoted strings.
+        String literals are skipped as whole tokens, so commas and braces
+        inside quoted values are never touched.
 
         Args:
             text: Potentially malformed JSON string
@@ -306,8 +691,11 @@ class GeminiClient:
         """
         # Remove surrounding code fences first
         t = text.strip()
-        t = re.sub(r"^```(?:json)?\s*", "", t, flags=re.IGNORECASE)
-        t = re.sub(r"\s*```$", "", t)
+        match = _FENCE_OPEN_RE.match(t)
+        if match:
+            t = t[match.end() :]
+        if t.endswith("```"):
+            t = t[:-3]
 
         # Extract the first {...} block if there is one
         start = t.find("{")
@@ -317,9 +705,8 @@ class GeminiClient:
             return None
         body = t[start : end + 1]
 
-        # Remove trailing commas just before } or ] (safer regex)
-        # Matches comma followed by whitespace and closing bracket
-        body = re.sub(r",\s*(?=[}\]])", "", body)
+        # Drop trailing commas and measure brace balance in a single pass
+        body, unclosed = _clean_json_body(body)
 
         # Try incremental repairs: try parse; if fails, attempt small fixes
         try:
@@ -327,10 +714,8 @@ class GeminiClient:
             return result
         except json.JSONDecodeError:
             # Last ditch: try to balance braces (only if clearly truncated)
-            open_count = body.count("{")
-            close_count = body.count("}")
-            if open_count > close_count and (open_count - close_count) <= 2:
-                body += "}" * (open_count - close_count)
+            if 0 < unclosed <= 2:
+                body += "}" * unclosed
                 try:
                     parsed: dict[str, Any] = json.loads(body)
                     logger.info("JSON repair successful (added closing braces)")
@@ -359,39 +744,382 @@ class GeminiClient:
             RuntimeError: If API call fails and fallback disabled
         """
         start_time = time.time()
-        error_type = None
+
+        # Byte-identical prompts are answered from the exact-match cache
+        cache_key, cached = self._cache_lookup(messages)
+        if cached is not None:
+            return cached
+
+        # Paraphrases are answered from the semantic cache (if enabled)
+        if self._semantic_cache is not None:
+            cached = self._semantic_lookup(messages)
+            if cached is not None:
+                return cached
 
         try:
             # Make API call with retries
             raw_response = self._make_api_call(messages)
+            result = self._process_response(raw_response, start_time, fallback_on_error)
+        except Exception as e:
+            return self._handle_analysis_error(e, fallback_on_error)
+
+        self._cache_store(cache_key, result)
+        if self._semantic_cache is not None:
+            self._semantic_store(messages, result)
+        return result
+
+    async def aanalyze(
+        self, messages: list[dict[str, str]], *, fallback_on_error: bool = True
+    ) -> dict[str, Any]:
+        """
+        Analyze message using Gemini API without blocking the event loop.
 
-            # Strip code fences if present
-            cleaned_response = self._strip_code_fences(raw_response)
+        Args:
+            messages: Prompt messages in OpenAI format (role, content)
+            fallback_on_error: If True, return safe fallback on API errors
 
-            # Parse JSON
+        Returns:
+            Validated dict matching AnalyzeResponse schema
+
+        Raises:
+            RuntimeError: If API call fails and fallback disabled
+        """
+        start_time = time.time()
+
+        cache_key, cached = await self._acache_lookup(messages)
+        if cached is not None:
+            return cached
+
+        # Embedding is CPU-bound, so keep it off the event loop
+        if self._semantic_cache is not None:
+            cached = await asyncio.to_thread(self._semantic_lookup, messages)
+            if cached is not None:
+                return cached
+
+        # Concurrent identical prompts share one API call
+        inflight_key = f"{cache_key or self._cache_key(messages)}:{fallback_on_error}"
+        pending = self._inflight.get(inflight_key)
+        if pending is not None:
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._inflight[inflight_key] = future
+        try:
             try:
-                parsed_data = json.loads(cleaned_response)
-            except json.JSONDecodeError as e:
-                logger.warning("JSON parse failed, attempting repair (no content logged)")
-                error_type = "json_parse_error"
+                raw_response = await self._amake_api_call(messages)
+                result = self._process_response(raw_response, start_time, fallback_on_error)
+            except Exception as e:
+                result = self._handle_analysis_error(e, fallback_on_error)
+
+            await self._acache_store(cache_key, result)
+            future.set_result(copy.deepcopy(result))
+            if self._semantic_cache is not None:
+                await asyncio.to_thread(self._semantic_store, messages, result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody was waiting
+            raise
+        finally:
+            del self._inflight[inflight_key]
+
+    async def aanalyze_stream(
+        self, messages: list[dict[str, str]], *, fallback_on_error: bool = True
+    ) -> AsyncIterator[tuple[bool, dict[str, Any]]]:
+        """
+        Analyze message, yielding top-level fields as soon as they arrive.
+
+        While the response streams in, yields (False, fields) with the
+        newly completed top-level fields (raw, not yet validated). Ends
+        with (True, result), where result is exactly what aanalyze()
+        would return.
+
+        Args:
+            messages: Prompt messages in OpenAI format (role, content)
+            fallback_on_error: If True, finish with a fallback on API errors
+
+        Yields:
+            (final, data) tuples
+
+        Raises:
+            RuntimeError: If API call fails and fallback disabled
+        """
+        start_time = time.time()
+
+        cache_key, cached = await self._acache_lookup(messages)
+        if cached is not None:
+            yield True, cached
+            return
+
+        parser = _StreamingFieldParser()
+        try:
+            response = await self._aopen_stream(messages)
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:  # chunk without text parts (finish metadata)
+                    continue
+                fields = parser.feed(text)
+                if fields:
+                    yield False, fields
+            result = self._process_response(parser.buffer, start_time, fallback_on_error)
+        except Exception as e:
+            result = self._handle_analysis_error(e, fallback_on_error)
+
+        await self._acache_store(cache_key, result)
+        yield True, result
+
+    async def aanalyze_concurrent(
+        self,
+        batch: list[list[dict[str, str]]],
+        *,
+        max_concurrency: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Analyze several prompts with overlapping API calls.
+
+        Unlike analyze_many() (one call, many messages), each prompt gets
+        its own call; a semaphore caps how many are in flight at once.
+
+        Args:
+            batch: List of prompts, each a list of message dicts
+            max_concurrency: In-flight limit (defaults to config.max_concurrency)
+
+        Returns:
+            List of validated dicts (same order as input); failed prompts
+            get fallback responses
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.config.max_concurrency)
+
+        async def _one(messages: list[dict[str, str]]) -> dict[str, Any]:
+            async with semaphore:
+                return await self.aanalyze(messages, fallback_on_error=True)
+
+        return list(await asyncio.gather(*(_one(messages) for messages in batch)))
+
+    def _cache_key(self, messages: list[dict[str, str]]) -> str:
+        """Hash of everything that determines the model's output."""
+        payload = orjson.dumps(
+            {
+                "model": self.config.model_name,
+                "temperature": self.config.temperature,
+                "max_tokens": self.config.max_tokens,
+                "messages": messages,
+            },
+            option=orjson.OPT_SORT_KEYS,
+        )
+        # 128-bit blake2b: collision-safe for a cache and cheaper than sha256
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _cache_lookup(
+        self, messages: list[dict[str, str]]
+    ) -> tuple[str | None, dict[str, Any] | None]:
+        """
+        Look up prompt in the exact-match cache.
+
+        Returns:
+            (cache key, copy of cached response or None); key is None when
+            caching is disabled
+        """
+        if self._response_cache is None:
+            return None, None
+
+        key = self._cache_key(messages)
+        cached = self._response_cache.get(key)
+        if cached is None:
+            return key, None
+
+        # Callers annotate model_debug in place, so hand out a copy
+        result = copy.deepcopy(cached)
+        result.setdefault("model_debug", {})["cache"] = "exact_hit"
+        return key, result
+
+    def _cache_store(self, key: str | None, result: dict[str, Any]) -> None:
+        """Cache a validated LLM response (fallbacks are never cached)."""
+        if key is None or result.get("model_debug", {}).get("fallback_used", False):
+            return
+        self._response_cache.set(key, copy.deepcopy(result))  # type: ignore[union-attr]
+
+    async def _acache_lookup(
+        self, messages: list[dict[str, str]]
+    ) -> tuple[str | None, dict[str, Any] | None]:
+        """_cache_lookup, run off the event loop when the cache is on disk."""
+        if isinstance(self._response_cache, SQLiteCache):
+            return await asyncio.to_thread(self._cache_lookup, messages)
+        return self._cache_lookup(messages)
+
+    async def _acache_store(self, key: str | None, result: dict[str, Any]) -> None:
+        """_cache_store, run off the event loop when the cache is on disk."""
+        if isinstance(self._response_cache, SQLiteCache):
+            await asyncio.to_thread(self._cache_store, key, result)
+        else:
+            self._cache_store(key, result)
+
+    def _semantic_lookup(self, messages: list[dict[str, str]]) -> dict[str, Any] | None:
+        """Return copy of the response for the most similar prior prompt, if any."""
+        # Only the final user turn varies; system prompt and examples are shared
+        hit = self._semantic_cache.lookup(messages[-1]["content"])  # type: ignore[union-attr]
+        if hit is None:
+            return None
+
+        similarity, cached = hit
+        result = copy.deepcopy(cached)
+        result.setdefault("model_debug", {}).update(
+            {"cache": "semantic", "similarity": round(similarity, 4)}
+        )
+        return result
+
+    def _semantic_store(self, messages: list[dict[str, str]], result: dict[str, Any]) -> None:
+        """Add a validated LLM response to the semantic cache."""
+        if result.get("model_debug", {}).get("fallback_used", False):
+            return
+        self._semantic_cache.add(  # type: ignore[union-attr]
+            messages[-1]["content"], copy.deepcopy(result)
+        )
+
+    def _process_response(
+        self, raw_response: str, start_time: float, fallback_on_error: bool
+    ) -> dict[str, Any]:
+        """
+        Parse, repair and validate raw response text.
+
+        Args:
+            raw_response: Raw text returned by Gemini
+            start_time: Time the analysis started (for latency metadata)
+            fallback_on_error: If True, return fallback when JSON repair fails
 
-                # Attempt repair
-                parsed_data = self._attempt_json_repair(cleaned_response)
+        Returns:
+            Validated dict matching AnalyzeResponse schema
 
-                if parsed_data is None:
-                    if fallback_on_error:
-                        logger.error("JSON repair failed, using fallback")
-                        return self._generate_fallback_response(error_type=error_type)
-                    else:
-                        raise ValueError(f"Invalid JSON response: {type(e).__name__}") from e
+        Raises:
+            ValueError: If response invalid and fallback disabled
+        """
+        try:
+            # Fast path: response_mime_type="application/json" is almost always
+            # honoured, so parse and validate the raw text in one pydantic-core
+            # pass without building an intermediate dict
+            validated_data = AnalyzeResponse.model_validate_json(raw_response).model_dump()
+        except ValidationError as e:
+            if e.errors(include_url=False)[0]["type"] != "json_invalid":
+                logger.error("Response validation failed: %s", e)
+                raise ValueError(f"Invalid response structure: {e}") from e
+
+            parsed_data = self._parse_with_cleanup(raw_response)
+            if parsed_data is None:
+                if fallback_on_error:
+                    logger.error("JSON repair failed, using fallback")
+                    return self._generate_fallback_response(error_type="json_parse_error")
+                raise ValueError("Invalid JSON response: JSONDecodeError") from e
 
             # Validate against schema
             validated_data = self._validate_json_structure(parsed_data)
 
-            # Add debug metadata (safe: no user content)
-            elapsed_ms = (time.time() - start_time) * 1000
-            # Ensure model_debug exists and is a dict
-            if "model_debug" not in validated_data or validated_data["model_debug"] is None:
+        # Add debug metadata (safe: no user content)
+        elapsed_ms = (time.time() - start_time) * 1000
+        # Ensure model_debug exists and is a dict
+        if "model_debug" not in validated_data or validated_data["model_debug"] is None:
+            validated_data["model_debug"] = {}
+        validated_data["model_debug"].update(
+            {
+                "model": self.config.model_name,
+                "latency_ms": round(elapsed_ms, 2),
+                "fallback_used": False,
+            }
+        )
+
+        return validated_data
+
+    def _parse_with_cleanup(self, raw_response: str) -> Any:
+        """
+        Parse a response that is not plain JSON (fenced or malformed).
+
+        Returns:
+            Parsed JSON value, or None if repair failed
+        """
+        self.slow_path_parses += 1
+        logger.debug("Response needed cleanup before parsing (total=%d)", self.slow_path_parses)
+
+        # Strip code fences if present (orjson's error subclasses json.JSONDecodeError)
+        cleaned_response = self._strip_code_fences(raw_response)
+        try:
+            return orjson.loads(cleaned_response)
+        except json.JSONDecodeError:
+            logger.warning("JSON parse failed, attempting repair (no content logged)")
+            return self._attempt_json_repair(cleaned_response)
+
+    def _handle_analysis_error(self, e: Exception, fallback_on_error: bool) -> dict[str, Any]:
+        """
+        Return fallback for a failed analysis, or raise if fallback disabled.
+
+        Raises:
+            RuntimeError: If fallback disabled
+        """
+        error_type = type(e).__name__
+        logger.warning("LLM call failed: %s (use fallback=%s)", error_type, fallback_on_error)
+
+        if fallback_on_error:
+            logger.info("Using fallback response due to error")
+            return self._generate_fallback_response(error_type=error_type)
+        else:
+            raise RuntimeError(f"LLM analysis failed: {error_type}") from e
+
+    def analyze_many(
+        self, messages: list[dict[str, str]], count: int, *, fallback_on_error: bool = True
+    ) -> list[dict[str, Any]]:
+        """
+        Analyze several messages batched into one prompt with a single API call.
+
+        Expects the model to return a JSON array with one object per message
+        (see PromptBuilder.build_batch_analysis_prompt). Items that fail
+        validation are replaced individually by the fallback response.
+
+        Args:
+            messages: Batched prompt messages in OpenAI format (role, content)
+            count: Number of analyses expected in the response array
+            fallback_on_error: If True, return fallbacks instead of raising
+
+        Returns:
+            List of validated dicts matching AnalyzeResponse schema, in input order
+
+        Raises:
+            RuntimeError: If the call or parsing fails and fallback disabled
+        """
+        start_time = time.time()
+
+        try:
+            raw_response = self._make_api_call(messages)
+            parsed_data = orjson.loads(self._strip_code_fences(raw_response))
+            if isinstance(parsed_data, dict):
+                # Tolerate {"results": [...]} style wrappers
+                parsed_data = next((v for v in parsed_data.values() if isinstance(v, list)), None)
+            if not isinstance(parsed_data, list) or len(parsed_data) != count:
+                raise ValueError("Batched response does not match message count")
+        except Exception as e:
+            error_type = type(e).__name__
+            logger.warning(
+                "Batched LLM call failed: %s (use fallback=%s)", error_type, fallback_on_error
+            )
+            if fallback_on_error:
+                return [
+                    self._generate_fallback_response(error_type=error_type) for _ in range(count)
+                ]
+            raise RuntimeError(f"LLM batch analysis failed: {error_type}") from e
+
+        elapsed_ms = (time.time() - start_time) * 1000
+        results: list[dict[str, Any]] = []
+        for item in parsed_data:
+            try:
+                validated_data = self._validate_json_structure(item)
+            except ValueError:
+                if not fallback_on_error:
+                    raise
+                results.append(self._generate_fallback_response(error_type="ValueError"))
+                continue
+
+            if validated_data.get("model_debug") is None:
                 validated_data["model_debug"] = {}
             validated_data["model_debug"].update(
                 {
@@ -400,18 +1128,9 @@ class GeminiClient:
                     "fallback_used": False,
                 }
             )
+            results.append(validated_data)
 
-            return validated_data
-
-        except Exception as e:
-            error_type = type(e).__name__
-            logger.warning("LLM call failed: %s (use fallback=%s)", error_type, fallback_on_error)
-
-            if fallback_on_error:
-                logger.info("Using fallback response due to error")
-                return self._generate_fallback_response(error_type=error_type)
-            else:
-                raise RuntimeError(f"LLM analysis failed: {error_type}") from e
+        return results
 
     def _generate_fallback_response(self, error_type: str | None = None) -> dict[str, Any]:
         """
@@ -425,16 +1144,12 @@ class GeminiClient:
         Returns:
             Dict matching AnalyzeResponse schema
         """
+        # Callers annotate the result in place, so containers are fresh per call
         fallback = {
-            "sentiment": "neutral",
-            "emotion": "neutral",
-            "stress_score": 5,
-            "category": "general",
+            **_FALLBACK_TEMPLATE,
             "key_phrases": [],
-            "suggested_reply": "Thank you for your message. Let me review this and get back to you.",
-            "action_items": ["Review message", "Follow up with sender"],
-            "confidence_scores": {"sentiment": 0.5, "emotion": 0.5, "category": 0.5, "stress": 0.5},
-            "urgency": False,
+            "action_items": list(_FALLBACK_ACTION_ITEMS),
+            "confidence_scores": dict(_FALLBACK_CONFIDENCE),
             "model_debug": {"model": "fallback", "fallback_used": True, "error_type": error_type},
         }
 
@@ -442,6 +1157,174 @@ class GeminiClient:
         return fallback
 
 
+class GeminiClientPool:
+    """
+    Spread analysis calls across several Gemini API keys.
+
+    Each key gets its own GeminiClient (and so its own RPM cap and
+    concurrency limit); calls go to the client with the fewest calls in
+    flight. When a key's quota is exhausted (ResourceExhausted after
+    retries), the call fails over to the next least-loaded sibling.
+
+    Exposes the same analysis interface as GeminiClient, so it can be
+    passed to MessageAnalyzer unchanged. Response caches are shared by
+    all clients in the pool.
+
+    Build the pool inside the event loop that will use it (e.g. the
+    FastAPI lifespan): gRPC async channels are bound to a loop.
+    """
+
+    def __init__(self, configs: list[LLMConfig]):
+        """
+        Initialize one client per config.
+
+        Args:
+            configs: One LLMConfig per API key
+
+        Raises:
+            ValueError: If configs is empty
+        """
+        if not configs:
+            raise ValueError("GeminiClientPool requires at least one LLMConfig")
+
+        self.clients: list[GeminiClient] = []
+        for config in configs:
+            if self.clients:
+                # Caches are built once (by the first client) and shared
+                config = replace(config, response_cache_size=0, semantic_cache_threshold=None)
+            client = GeminiClient(config)
+            if self.clients:
+                client._response_cache = self.clients[0]._response_cache
+                client._semantic_cache = self.clients[0]._semantic_cache
+            self.clients.append(client)
+
+        self.config = self.clients[0].config
+        self._inflight = [0] * len(self.clients)
+        self._semaphores = [asyncio.Semaphore(c.config.max_concurrency) for c in self.clients]
+        self._lock = threading.Lock()
+
+        logger.info("Initialized Gemini client pool: size=%d", len(self.clients))
+
+    def _acquire(self, exclude: set[int]) -> int:
+        """Reserve the least-loaded client not in exclude; return its index."""
+        with self._lock:
+            index = min(
+                (i for i in range(len(self.clients)) if i not in exclude),
+                key=self._inflight.__getitem__,
+            )
+            self._inflight[index] += 1
+            return index
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self._inflight[index] -= 1
+
+    def _should_fail_over(self, e: Exception, tried: set[int]) -> bool:
+        """True if e is a quota error and an untried client remains."""
+        if not isinstance(e.__cause__ or e, ResourceExhausted) or len(tried) >= len(self.clients):
+            return False
+        logger.warning(
+            "Gemini quota exhausted, failing over (%d/%d keys tried)", len(tried), len(self.clients)
+        )
+        return True
+
+    def _fallback(self, e: Exception, fallback_on_error: bool) -> dict[str, Any]:
+        """Return fallback for a call that failed on every eligible client."""
+        if not fallback_on_error:
+            raise e
+        return self.clients[0]._generate_fallback_response(
+            error_type=type(e.__cause__ or e).__name__
+        )
+
+    def analyze(
+        self, messages: list[dict[str, str]], *, fallback_on_error: bool = True
+    ) -> dict[str, Any]:
+        """Analyze message on the least-loaded client (see GeminiClient.analyze)."""
+        tried: set[int] = set()
+        while True:
+            index = self._acquire(tried)
+            tried.add(index)
+            try:
+                return self.clients[index].analyze(messages, fallback_on_error=False)
+            except Exception as e:
+                if self._should_fail_over(e, tried):
+                    continue
+                return self._fallback(e, fallback_on_error)
+            finally:
+                self._release(index)
+
+    async def aanalyze(
+        self, messages: list[dict[str, str]], *, fallback_on_error: bool = True
+    ) -> dict[str, Any]:
+        """Analyze message on the least-loaded client (see GeminiClient.aanalyze)."""
+        tried: set[int] = set()
+        while True:
+            index = self._acquire(tried)
+            tried.add(index)
+            try:
+                async with self._semaphores[index]:
+                    return await self.clients[index].aanalyze(messages, fallback_on_error=False)
+            except Exception as e:
+                if self._should_fail_over(e, tried):
+                    continue
+                return self._fallback(e, fallback_on_error)
+            finally:
+                self._release(index)
+
+    async def aanalyze_concurrent(
+        self, batch: list[list[dict[str, str]]], *, max_concurrency: int | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Analyze several prompts with overlapping API calls across all keys.
+
+        Per-key limits come from each client's max_concurrency; pass
+        max_concurrency to cap the pool-wide total as well.
+        """
+        limit = max_concurrency or sum(c.config.max_concurrency for c in self.clients)
+        semaphore = asyncio.Semaphore(limit)
+
+        async def _one(messages: list[dict[str, str]]) -> dict[str, Any]:
+            async with semaphore:
+                return await self.aanalyze(messages, fallback_on_error=True)
+
+        return list(await asyncio.gather(*(_one(messages) for messages in batch)))
+
+    def analyze_many(
+        self, messages: list[dict[str, str]], count: int, *, fallback_on_error: bool = True
+    ) -> list[dict[str, Any]]:
+        """Analyze a batched prompt on the least-loaded client."""
+        index = self._acquire(set())
+        try:
+            return self.clients[index].analyze_many(
+                messages, count, fallback_on_error=fallback_on_error
+            )
+        finally:
+            self._release(index)
+
+    async def warmup(self, timeout: float = 5.0) -> bool:
+        """Warm up every client; True only if all succeeded."""
+        results = await asyncio.gather(*(c.warmup(timeout=timeout) for c in self.clients))
+        return all(results)
+
+    async def aclose(self) -> None:
+        """Close every client's channels."""
+        for client in self.clients:
+            await client.aclose()
+
+
+def _apply_cache_env(kwargs: dict[str, Any]) -> None:
+    """Fill response/semantic cache settings from the environment (explicit kwargs win)."""
+    # Share the response cache across workers if a cache file is configured
+    if os.getenv("LLM_RESPONSE_CACHE_PATH"):
+        kwargs.setdefault("response_cache_path", os.environ["LLM_RESPONSE_CACHE_PATH"])
+
+    # Answer paraphrases of earlier messages from the semantic cache
+    if os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD"):
+        kwargs.setdefault(
+            "semantic_cache_threshold", float(os.environ["LLM_SEMANTIC_CACHE_THRESHOLD"])
+        )
+
+
 def create_gemini_client(
     api_key: str | None = None, model_name: str | None = None, **kwargs
 ) -> GeminiClient:
@@ -471,7 +1354,46 @@ def create_gemini_client(
     if model_name is None:
         model_name = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
 
+    _apply_cache_env(kwargs)
+
     # Create config
     config = LLMConfig(api_key=api_key, model_name=model_name, **kwargs)
 
     return GeminiClient(config)
+
+
+def create_gemini_client_pool(
+    api_keys: list[str] | None = None, model_name: str | None = None, **kwargs
+) -> GeminiClientPool:
+    """
+    Factory function to create a pool of Gemini clients, one per API key.
+
+    Args:
+        api_keys: Gemini API keys (defaults to comma-separated GEMINI_API_KEYS
+            env var, then GEMINI_API_KEY)
+        model_name: Model to use (defaults to gemini-2.0-flash-exp)
+        **kwargs: Additional LLMConfig parameters (applied to every key)
+
+    Returns:
+        Configured GeminiClientPool instance
+
+    Raises:
+        ValueError: If no API keys provided and none in environment
+    """
+    if api_keys is None:
+        api_keys = [k.strip() for k in os.getenv("GEMINI_API_KEYS", "").split(",") if k.strip()]
+        if not api_keys and os.getenv("GEMINI_API_KEY"):
+            api_keys = [os.environ["GEMINI_API_KEY"]]
+        if not api_keys:
+            raise ValueError(
+                "GEMINI_API_KEYS not found in environment. Set it or pass api_keys parameter."
+            )
+
+    if model_name is None:
+        model_name = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
+
+    _apply_cache_env(kwargs)
+
+    return GeminiClientPool(
+        [LLMConfig(api_key=key, model_name=model_name, **kwargs) for key in api_keys]
+    )
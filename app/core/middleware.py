@@ -0,0 +1,97 @@
+"""
+ASGI middleware for request guards.
+
+Responsibilities:
+- Reject oversize request bodies before the app reads them
+
+Implemented as plain ASGI callables (not BaseHTTPMiddleware) so rejected
+requests never reach Starlette's Request/body machinery.
+
+Version: 1.0.0
+"""
+
+import orjson
+from fastapi import HTTPException, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ContentLengthLimitMiddleware:
+    """
+    Enforce a maximum request body size.
+
+    Requests declaring a Content-Length above the limit get a 413 without
+    the body being read. Bodies without Content-Length (chunked uploads)
+    are counted as they stream in and rejected once the limit is crossed.
+    """
+
+    def __init__(self, app: ASGIApp, *, max_bytes: int):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            max_bytes: Maximum accepted body size in bytes
+        """
+        self.app = app
+        self.max_bytes = max_bytes
+        self._error = {
+            "success": False,
+            "error": "payload_too_large",
+            "message": "Request body too large",
+            "details": {"max_bytes": max_bytes},
+        }
+        self._body = orjson.dumps(self._error)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = None
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                content_length = value
+                break
+
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                declared = -1
+            if declared > self.max_bytes:
+                await self._reject(send)
+                return
+            if declared >= 0:
+                # Declared size is within the limit; the server enforces it
+                await self.app(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI re-raises HTTPException from body reads as-is
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=self._error
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, send: Send) -> None:
+        """Send the pre-serialized 413 response."""
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(self._body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": self._body})
@@ -17,14 +17,24 @@ import html
 import logging
 import re
 import unicodedata
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from itertools import groupby
+from typing import Any
+
+try:
+    # Optional google-re2: guaranteed linear-time matching on untrusted input
+    # for every signature/PII scan (no backreferences are used in those)
+    import re2 as _scan_re
+except ImportError:
+    _scan_re = re
 
 logger = logging.getLogger(__name__)
 
 
-# Confusable homoglyph mapping (prevents visual obfuscation attacks)
+# Confusable homoglyph mapping (prevents visual obfuscation attacks).
+# Keys must be non-ASCII: canonicalization skips folding for ASCII text.
 _CONFUSABLES = {
     "\u043e": "o",  # Cyrillic small o
     "\u0456": "i",  # Cyrillic small byelorussian-ukrainian i
@@ -45,6 +55,59 @@ _CONFUSABLES = {
     "\u03c1": "p",  # Greek small rho
 }
 
+# str.translate table for _CONFUSABLES (folding runs in C, one pass)
+_CONFUSABLE_TRANS = str.maketrans(_CONFUSABLES)
+
+
+# str.translate deletion tables (one C-level pass each).
+# Zero-width space/non-joiner/joiner, BOM, and bidi embedding/override marks:
+_INVISIBLE_DELETE = dict.fromkeys([0x200B, 0x200C, 0x200D, 0xFEFF, *range(0x202A, 0x202F)])
+# C0/C1 control characters and NUL, keeping tab, newline and carriage return:
+_CONTROL_DELETE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), *range(0x7F, 0xA0)]
+)
+# The ASCII part of _CONTROL_DELETE, for bytes.translate on ASCII input
+_CONTROL_DELETE_BYTES = bytes(k for k in _CONTROL_DELETE if k < 0x80)
+
+# Every INJECTION_PATTERNS match contains one of these literals (canonical
+# text is lowercase with single spaces), so ASCII text without any of them
+# cannot match. Non-ASCII text skips this gate: re's IGNORECASE also folds
+# some non-ASCII letters (e.g. U+017F long s) onto ASCII ones
+_INJECTION_KEYWORDS = (
+    "ignore",
+    "disregard",
+    "forget",
+    "system",
+    "assistant",
+    "user",
+    "im_start",
+    "im_end",
+    "pretend",
+    "act as",
+    "new ",
+    "override",
+    "you must",
+    "from now on you",
+    "sudo mode",
+    "developer mode",
+)
+
+# Replacement for a detected prompt injection span
+_INJECTION_PLACEHOLDER = "[REMOVED: Potential security violation]"
+
+# Placeholder for each named group of InputSanitizer._PII_RE
+_PII_PLACEHOLDERS = {
+    "email": "[EMAIL_REDACTED]",
+    "phone": "[PHONE_REDACTED]",
+    "ssn": "[SSN_REDACTED]",
+    "card": "[CARD_REDACTED]",
+}
+
+
+def _redact_match(match: "re.Match[str]") -> str:
+    """Replacement for a PII match: the placeholder for its kind."""
+    return _PII_PLACEHOLDERS[match.lastgroup]  # type: ignore[index]
+
 
 # Threat scoring weights (explainable and tunable)
 THREAT_WEIGHTS = {
@@ -64,7 +127,11 @@ class ThreatLevel(str, Enum):
     CRITICAL = "critical"
 
 
-@dataclass(frozen=True)
+# Levels at which a message still counts as safe
+_SAFE_THREAT_LEVELS = frozenset({ThreatLevel.NONE, ThreatLevel.LOW})
+
+
+@dataclass(frozen=True, slots=True)
 class SanitizationResult:
     """
     Immutable result of sanitization process.
@@ -73,16 +140,16 @@ class SanitizationResult:
         sanitized_text: Cleaned and safe text
         is_safe: Whether text passes safety threshold
         threat_level: Assessed threat severity
-        detected_threats: List of specific threats found
-        modifications_made: List of transformations applied
+        detected_threats: Specific threats found
+        modifications_made: Transformations applied
         original_length: Length of original input (for audit)
     """
 
     sanitized_text: str
     is_safe: bool
     threat_level: ThreatLevel
-    detected_threats: list[str] = field(default_factory=list)
-    modifications_made: list[str] = field(default_factory=list)
+    detected_threats: tuple[str, ...] = ()
+    modifications_made: tuple[str, ...] = ()
     original_length: int = 0
 
 
@@ -147,24 +214,16 @@ class InputSanitizer:
     MAX_CHAR_REPETITION = 50
     MAX_WORD_REPETITION = 10
 
-    # Pre-compiled regexes (P1-1 fix: performance optimization)
-    _INJECTION_REGEXES = None
-    _CODE_REGEXES = None
-    _EMAIL_RE = None
-    _PHONE_RE = None
-    _SSN_RE = None
-    _CARD_RE = None
-
-    @classmethod
-    def _ensure_compiled_regexes(cls) -> None:
-        """Lazy compilation of regex patterns."""
-        if cls._INJECTION_REGEXES is None:
-            cls._INJECTION_REGEXES = [re.compile(p, re.IGNORECASE) for p in cls.INJECTION_PATTERNS]
-            cls._CODE_REGEXES = [re.compile(p, re.IGNORECASE) for p in cls.CODE_PATTERNS]
-            cls._EMAIL_RE = re.compile(cls.EMAIL_PATTERN)
-            cls._PHONE_RE = re.compile(cls.PHONE_PATTERN)
-            cls._SSN_RE = re.compile(cls.SSN_PATTERN)
-            cls._CARD_RE = re.compile(cls.CREDIT_CARD_PATTERN)
+    # Pre-compiled regexes (P1-1 fix: performance optimization); assigned
+    # at module import, below the class
+    _INJECTION_UNION: Any
+    _INJECTION_REGEXES: list[Any]
+    _CODE_UNION: Any
+    _PII_RE: Any
+    _CANON_NONWORD_RE: re.Pattern[str]
+    _CHAR_REPEAT_RE: re.Pattern[str]
+    _DOUBLE_SPACE_RE: re.Pattern[str]
+    _NEWLINE_RUN_RE: re.Pattern[str]
 
     @classmethod
     def _fold_confusables(cls, text: str) -> str:
@@ -172,7 +231,7 @@ class InputSanitizer:
         Replace common homoglyphs with ASCII equivalents (P0-1 fix).
         Prevents visual obfuscation attacks using lookalike characters.
         """
-        return "".join(_CONFUSABLES.get(ch, ch) for ch in text)
+        return text.translate(_CONFUSABLE_TRANS)
 
     @classmethod
     def _canonicalize_for_matching(cls, text: str) -> str:
@@ -182,23 +241,80 @@ class InputSanitizer:
         Process:
         1. Unicode normalization (NFC)
         2. Confusable folding
-        3. Punctuation removal
-        4. Whitespace normalization
-        5. Lowercase
+        3. Punctuation removal and whitespace normalization (one pass)
+        4. Lowercase
+
+        Steps 1-2 are skipped for ASCII text: it is already NFC, and every
+        _CONFUSABLES key is non-ASCII.
         """
-        # Normalize Unicode
-        txt = unicodedata.normalize("NFC", text)
+        txt = text
+        if not text.isascii():
+            # Normalize Unicode, then fold confusables
+            txt = cls._fold_confusables(unicodedata.normalize("NFC", text))
 
-        # Fold confusables
-        txt = cls._fold_confusables(txt)
+        # Each run of punctuation/whitespace becomes a single space
+        txt = cls._CANON_NONWORD_RE.sub(" ", txt)
 
-        # Remove punctuation except word boundaries
-        txt = re.sub(r"[^\w\s]", " ", txt)
+        return txt.strip().lower()
 
-        # Collapse whitespace and lowercase
-        txt = re.sub(r"\s+", " ", txt).strip().lower()
+    @classmethod
+    def _canonicalize_with_offsets(cls, text: str) -> tuple[str, list[int], list[int]] | None:
+        """
+        Canonicalize like _canonicalize_for_matching, tracking source spans.
 
-        return txt
+        Returns (canonical, starts, ends) where canonical[i] came from
+        text[starts[i]:ends[i]], or None if NFC changed the length (the
+        mapping is then not positional).
+        """
+        folded = text
+        if not text.isascii():
+            folded = cls._fold_confusables(unicodedata.normalize("NFC", text))
+            if len(folded) != len(text):
+                return None
+
+        pieces: list[str] = []
+        starts: list[int] = []
+        ends: list[int] = []
+        pos = 0
+        for match in cls._CANON_NONWORD_RE.finditer(folded):
+            cls._append_word(folded, pos, match.start(), pieces, starts, ends)
+            # Each punctuation/whitespace run becomes one space spanning it
+            pieces.append(" ")
+            starts.append(match.start())
+            ends.append(match.end())
+            pos = match.end()
+        cls._append_word(folded, pos, len(folded), pieces, starts, ends)
+
+        # Same strip() as _canonicalize_for_matching: the runs are single spaces
+        if pieces and pieces[-1] == " ":
+            del pieces[-1], starts[-1], ends[-1]
+        if pieces and pieces[0] == " ":
+            del pieces[0], starts[0], ends[0]
+
+        return "".join(pieces), starts, ends
+
+    @staticmethod
+    def _append_word(
+        text: str,
+        start: int,
+        end: int,
+        pieces: list[str],
+        starts: list[int],
+        ends: list[int],
+    ) -> None:
+        """Append lowercased text[start:end] one char at a time, with its spans."""
+        lowered = text[start:end].lower()
+        if len(lowered) == end - start:
+            pieces.extend(lowered)
+            starts.extend(range(start, end))
+            ends.extend(range(start + 1, end + 1))
+            return
+        # Some characters lowercase to several (e.g. U+0130)
+        for index in range(start, end):
+            for char in text[index].lower():
+                pieces.append(char)
+                starts.append(index)
+                ends.append(index + 1)
 
     @classmethod
     def sanitize(
@@ -223,8 +339,6 @@ class InputSanitizer:
         Returns:
             SanitizationResult with sanitized text and threat assessment
         """
-        cls._ensure_compiled_regexes()
-
         if text is None or not text:
             return SanitizationResult(
                 sanitized_text="",
@@ -233,24 +347,71 @@ class InputSanitizer:
                 original_length=0 if text is None else len(text),
             )
 
+        # Repeated messages ("ok", "thanks", templates) are served from the
+        # LRU; oversized inputs bypass it so the cache's memory stays bounded
+        pipeline = cls._run_pipeline if len(text) > cls.MAX_INPUT_LENGTH else cls._run_cached
+        result = pipeline(text, strict, preserve_formatting, redact_pii, html_escape)
+
+        # Logging for audit trail (P0-4 fix: no textual content), per call
+        if result.detected_threats:
+            logger.warning(
+                "Sanitizer detected threats",
+                extra={
+                    "threats": result.detected_threats,
+                    "threat_level": result.threat_level.value,
+                    "original_length": result.original_length,
+                    "sanitized_length": len(result.sanitized_text),
+                    "threat_count": len(result.detected_threats),
+                },
+            )
+
+        return result
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _run_cached(
+        cls,
+        text: str,
+        strict: bool,
+        preserve_formatting: bool,
+        redact_pii: bool,
+        html_escape: bool,
+    ) -> SanitizationResult:
+        """_run_pipeline, memoized on the input text and flags."""
+        return cls._run_pipeline(text, strict, preserve_formatting, redact_pii, html_escape)
+
+    @classmethod
+    def _run_pipeline(
+        cls,
+        text: str,
+        strict: bool,
+        preserve_formatting: bool,
+        redact_pii: bool,
+        html_escape: bool,
+    ) -> SanitizationResult:
+        """Run the full sanitization pipeline on non-empty text."""
         original_length = len(text)
         detected_threats: list[str] = []
         modifications: list[str] = []
 
-        # Step 1: Enforce input length limit FIRST (DOS protection)
-        if len(text) > cls.MAX_INPUT_LENGTH:
-            text = text[: cls.MAX_INPUT_LENGTH]
+        # Step 1: Enforce input length limit FIRST (DOS protection). Slicing
+        # a string that already fits returns the same object
+        truncated = text[: cls.MAX_INPUT_LENGTH]
+        if truncated is not text:
             modifications.append("Truncated to max length")
+            text = truncated
 
-        # Step 2: Unicode normalization (NFC)
-        text, normalized = cls._normalize_unicode(text)
-        if normalized:
-            modifications.append("Normalized Unicode")
+        # Steps 2-3 never change ASCII text (already NFC, no invisible chars)
+        if not text.isascii():
+            # Step 2: Unicode normalization (NFC)
+            text, normalized = cls._normalize_unicode(text)
+            if normalized:
+                modifications.append("Normalized Unicode")
 
-        # Step 3: Remove zero-width and bidi characters
-        text, removed = cls._remove_invisible_chars(text)
-        if removed:
-            modifications.append("Removed invisible characters")
+            # Step 3: Remove zero-width and bidi characters
+            text, removed = cls._remove_invisible_chars(text)
+            if removed:
+                modifications.append("Removed invisible characters")
 
         # Step 4: Detect prompt injections (with canonicalization)
         had_injection, text = cls._detect_and_remove_injections(text)
@@ -265,7 +426,9 @@ class InputSanitizer:
                 detected_threats.append("code_injection")
                 modifications.append("Removed code patterns")
 
-        # Step 6: HTML escape (if enabled) - using stdlib
+        # Step 6: HTML escape (if enabled) - using stdlib. Its five C-level
+        # str.replace calls are each a no-op scan on clean text, which beats
+        # a str.translate table (per-character mapping lookups) by ~10x here
         if html_escape:
             text = html.escape(text, quote=True)
             modifications.append("HTML escaped")
@@ -279,9 +442,10 @@ class InputSanitizer:
         # Step 8: Remove control characters
         text = cls._remove_control_chars(text)
 
-        # Step 9: Normalize whitespace
+        # Step 9: Normalize whitespace (the same pass notes any over-long line)
+        has_long_lines = True
         if not preserve_formatting:
-            text = cls._normalize_whitespace(text)
+            text, has_long_lines = cls._process_lines(text)
             modifications.append("Normalized whitespace")
 
         # Step 10: Remove excessive repetition (with fixed groupby logic)
@@ -290,171 +454,201 @@ class InputSanitizer:
             detected_threats.append("excessive_repetition")
             modifications.append("Removed excessive repetition")
 
-        # Step 11: Enforce line length limits
-        text = cls._enforce_line_length(text)
+        # Step 11: Enforce line length limits, after the clamp so it sees the
+        # clamped text. Skipped when step 9 found no long line and the clamp
+        # left the text alone
+        if has_long_lines or had_repetition:
+            text = cls._enforce_line_length(text)
 
         # Step 12: Final cleanup
         text = text.strip()
 
         # Threat assessment with weighted scoring (P1-5 fix)
-        threat_level = cls._calculate_threat_level(detected_threats)
-        is_safe = threat_level in [ThreatLevel.NONE, ThreatLevel.LOW]
-
-        # Logging for audit trail (P0-4 fix: no textual content)
         if detected_threats:
-            logger.warning(
-                "Sanitizer detected threats",
-                extra={
-                    "threats": detected_threats,
-                    "threat_level": threat_level.value,
-                    "original_length": original_length,
-                    "sanitized_length": len(text),
-                    "threat_count": len(detected_threats),
-                },
-            )
+            threat_level = cls._calculate_threat_level(detected_threats)
+            is_safe = threat_level in _SAFE_THREAT_LEVELS
+        else:
+            threat_level = ThreatLevel.NONE
+            is_safe = True
 
         return SanitizationResult(
             sanitized_text=text,
             is_safe=is_safe,
             threat_level=threat_level,
-            detected_threats=detected_threats,
-            modifications_made=modifications,
+            detected_threats=tuple(detected_threats),
+            modifications_made=tuple(modifications),
             original_length=original_length,
         )
 
     @classmethod
     def _normalize_unicode(cls, text: str) -> tuple[str, bool]:
         """Normalize Unicode to NFC form."""
-        original = text
-        text = unicodedata.normalize("NFC", text)
-        return text, text != original
+        # ASCII is already NFC; skip the decomposition table walk
+        if text.isascii():
+            return text, False
+        normalized = unicodedata.normalize("NFC", text)
+        return normalized, normalized != text
 
     @classmethod
     def _remove_invisible_chars(cls, text: str) -> tuple[str, bool]:
         """Remove zero-width characters and bidi overrides."""
-        original = text
-
-        # Remove zero-width characters
-        text = re.sub(r"[\u200B-\u200D\uFEFF]", "", text)
-
-        # Remove bidi override characters
-        text = re.sub(r"[\u202A-\u202E]", "", text)
-
-        # Remove zero-width joiner/non-joiner abuse
-        text = re.sub(r"[\u200C\u200D]{2,}", "", text)
-
-        return text, text != original
+        # Every invisible character is non-ASCII
+        if text.isascii():
+            return text, False
+        cleaned = text.translate(_INVISIBLE_DELETE)
+        # Only deletions happen, so a length change means something was removed
+        return cleaned, len(cleaned) != len(text)
 
     @classmethod
     def _detect_and_remove_injections(cls, text: str) -> tuple[bool, str]:
         """
         Detect and remove prompt injection attempts (P0-2, P0-3 fixes).
-        Uses canonicalized matching and conservative span replacement.
+        Matches found on the canonical text are mapped back to the original
+        text and spliced out, so obfuscated variants are removed too.
         """
-        found = False
-
-        # Canonicalize for matching
+        # Detect using canonicalized text (the common, clean path)
         normalized_for_matching = cls._canonicalize_for_matching(text)
-
-        # First pass: detect using canonicalized text
-        for regex in cls._INJECTION_REGEXES:
-            if regex.search(normalized_for_matching):
-                found = True
-
-        # Second pass: replace on original text if detected
-        if found:
+        if normalized_for_matching.isascii() and not any(
+            keyword in normalized_for_matching for keyword in _INJECTION_KEYWORDS
+        ):
+            return False, text
+        if not cls._INJECTION_UNION.search(normalized_for_matching):
+            return False, text
+
+        # Like the original per-pattern sub(count=1): each signature removes
+        # only its first match, so benign words that also appear in a
+        # signature (e.g. every "user" in a message) are left alone
+        mapped = cls._canonicalize_with_offsets(text)
+        if mapped is None or mapped[0] != normalized_for_matching:
+            # No positional mapping; replace whatever matches the original
             for regex in cls._INJECTION_REGEXES:
-                # Try to match and replace on original text
-                if regex.search(text):
-                    text = regex.sub("[REMOVED: Potential security violation]", text, count=1)
+                text = regex.sub(_INJECTION_PLACEHOLDER, text, count=1)
+            return True, text
 
-        return found, text
+        canonical, starts, ends = mapped
+        spans: list[tuple[int, int]] = []
+        for regex in cls._INJECTION_REGEXES:
+            for match in regex.finditer(canonical):
+                if match.end() == match.start():
+                    continue
+                # Skip text an earlier signature already removed
+                if all(match.end() <= lo or match.start() >= hi for lo, hi in spans):
+                    spans.append((match.start(), match.end()))
+                    break
+
+        parts: list[str] = []
+        pos = 0
+        for lo, hi in sorted(spans):
+            start = starts[lo]
+            if start < pos:
+                # Overlaps the previous span (shared punctuation run); merge
+                start = pos
+            else:
+                parts.append(text[pos:start])
+                parts.append(_INJECTION_PLACEHOLDER)
+            pos = max(pos, ends[hi - 1])
+        parts.append(text[pos:])
+        return True, "".join(parts)
 
     @classmethod
     def _remove_code_patterns(cls, text: str) -> tuple[bool, str]:
         """Remove code execution patterns in strict mode."""
-        found = False
-
-        for regex in cls._CODE_REGEXES:
-            if regex.search(text):
-                found = True
-                text = regex.sub("[code removed]", text, count=1)
+        text, count = cls._CODE_UNION.subn("[code removed]", text)
+        found = count > 0
 
-        # Remove code blocks (triple backticks) - careful replacement
-        if "```" in text:
+        # Remove code blocks (triple backticks): splice out each fenced pair
+        # in one walk; an unpaired trailing fence is dropped on its own
+        start = text.find("```")
+        if start >= 0:
             found = True
-            text = re.sub(r"```[^`]*```", "[code block removed]", text, flags=re.DOTALL)
-            text = text.replace("```", "")
+            parts = []
+            pos = 0
+            while start >= 0:
+                parts.append(text[pos:start])
+                end = text.find("```", start + 3)
+                if end < 0:
+                    pos = start + 3
+                    break
+                parts.append("[code block removed]")
+                pos = end + 3
+                start = text.find("```", pos)
+            parts.append(text[pos:])
+            text = "".join(parts)
 
         return found, text
 
     @classmethod
     def _redact_pii(cls, text: str) -> tuple[str, bool]:
         """Redact personally identifiable information."""
-        original = text
-
-        text = cls._EMAIL_RE.sub("[EMAIL_REDACTED]", text)
-        text = cls._PHONE_RE.sub("[PHONE_REDACTED]", text)
-        text = cls._SSN_RE.sub("[SSN_REDACTED]", text)
-        text = cls._CARD_RE.sub("[CARD_REDACTED]", text)
-
-        return text, text != original
+        text, count = cls._PII_RE.subn(_redact_match, text)
+        return text, count > 0
 
     @classmethod
     def _remove_control_chars(cls, text: str) -> str:
         """Remove null bytes and control characters."""
-        text = text.replace("\x00", "")
-        text = re.sub(r"[\x01-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]", "", text)
-        return text
+        if text.isascii():
+            # bytes.translate skips str.translate's per-character mapping lookups
+            return text.encode("ascii").translate(None, _CONTROL_DELETE_BYTES).decode("ascii")
+        return text.translate(_CONTROL_DELETE)
 
     @classmethod
-    def _normalize_whitespace(cls, text: str) -> str:
+    def _process_lines(cls, text: str) -> tuple[str, bool]:
         """
         Normalize whitespace preserving indentation (P0 fix).
         Only collapses excessive spaces within lines and excessive newlines.
+
+        Returns:
+            (normalized text, whether any line exceeds MAX_LINE_LENGTH)
         """
-        lines = text.split("\n")
-        normalized_lines = []
+        processed_lines = []
+        longest = 0
 
-        for line in lines:
+        for line in text.split("\n"):
             stripped = line.lstrip()
             leading_ws = line[: len(line) - len(stripped)]
             # Collapse multiple internal spaces
-            stripped = re.sub(r"  +", " ", stripped)
-            normalized_lines.append(leading_ws + stripped.rstrip())
+            line = leading_ws + cls._DOUBLE_SPACE_RE.sub(" ", stripped).rstrip()
+            longest = max(longest, len(line))
+            processed_lines.append(line)
 
         # Join and limit consecutive newlines to 2
-        text = "\n".join(normalized_lines)
-        text = re.sub(r"\n{3,}", "\n\n", text)
-
-        return text
+        text = cls._NEWLINE_RUN_RE.sub("\n\n", "\n".join(processed_lines))
+        return text, longest > cls.MAX_LINE_LENGTH
 
     @classmethod
     def _remove_excessive_repetition(cls, text: str) -> tuple[bool, str]:
         """
         Remove excessive character and word repetition (P1-2 fix: groupby).
-        Uses deterministic groupby approach for word repetition.
+        Word runs are scanned first; groupby only rebuilds the list on overflow.
         """
         found = False
 
         # Character repetition
-        pattern = r"(.)\1{" + str(cls.MAX_CHAR_REPETITION) + r",}"
-        if re.search(pattern, text):
+        if cls._CHAR_REPEAT_RE.search(text):
             found = True
-            text = re.sub(pattern, r"\1" * cls.MAX_CHAR_REPETITION, text)
+            text = cls._CHAR_REPEAT_RE.sub(r"\1" * cls.MAX_CHAR_REPETITION, text)
 
-        # Word repetition - Fixed with groupby
+        # Word repetition
         words = text.split()
-        if len(words) > 1:
+        prev = None
+        run = 0
+        overflow = False
+        for word in words:
+            lowered = word.lower()
+            run = run + 1 if lowered == prev else 1
+            prev = lowered
+            if run > cls.MAX_WORD_REPETITION:
+                overflow = True
+                break
+
+        if overflow:
+            found = True
             clamped = []
-            for _, group in groupby(words, key=lambda w: w.lower()):
-                g = list(group)
-                if len(g) > cls.MAX_WORD_REPETITION:
-                    found = True
-                clamped.extend(g[: cls.MAX_WORD_REPETITION])
-
-            if found:
-                text = " ".join(clamped)
+            for _, group in groupby(words, key=str.lower):
+                clamped.extend(list(group)[: cls.MAX_WORD_REPETITION])
+            text = " ".join(clamped)
+        elif found and len(words) > 1:
+            text = " ".join(words)
 
         return found, text
 
@@ -507,21 +701,10 @@ class InputSanitizer:
         Returns:
             True if text contains no detected PII
         """
-        cls._ensure_compiled_regexes()
-
         if not text:
             return True
 
-        if cls._EMAIL_RE.search(text):
-            return False
-        if cls._PHONE_RE.search(text):
-            return False
-        if cls._SSN_RE.search(text):
-            return False
-        if cls._CARD_RE.search(text):
-            return False
-
-        return True
+        return cls._PII_RE.search(text) is None
 
     @classmethod
     def redact_pii(cls, text: str | None) -> str | None:
@@ -534,10 +717,34 @@ class InputSanitizer:
         Returns:
             Text with PII redacted, or None if input was None
         """
-        cls._ensure_compiled_regexes()
-
         if text is None:
             return None
 
         redacted, _ = cls._redact_pii(text)
         return redacted
+
+
+# Each signature set is one alternation, so a clean message costs a single
+# search. Uses RE2 when installed (inline (?i) so the same pattern compiles
+# under both engines)
+InputSanitizer._INJECTION_UNION = _scan_re.compile(
+    "(?i)" + "|".join(f"(?:{p})" for p in InputSanitizer.INJECTION_PATTERNS)
+)
+InputSanitizer._INJECTION_REGEXES = [
+    _scan_re.compile(f"(?i){p}") for p in InputSanitizer.INJECTION_PATTERNS
+]
+InputSanitizer._CODE_UNION = _scan_re.compile(
+    "(?i)" + "|".join(f"(?:{p})" for p in InputSanitizer.CODE_PATTERNS)
+)
+# All PII kinds in one pass; the named group that matched picks the
+# placeholder. Also runs over raw user input, so same engine
+InputSanitizer._PII_RE = _scan_re.compile(
+    f"(?P<email>{InputSanitizer.EMAIL_PATTERN})|(?P<phone>{InputSanitizer.PHONE_PATTERN})"
+    f"|(?P<ssn>{InputSanitizer.SSN_PATTERN})|(?P<card>{InputSanitizer.CREDIT_CARD_PATTERN})"
+)
+InputSanitizer._CANON_NONWORD_RE = re.compile(r"[^\w]+")
+InputSanitizer._CHAR_REPEAT_RE = re.compile(
+    r"(.)\1{" + str(InputSanitizer.MAX_CHAR_REPETITION) + r",}"
+)
+InputSanitizer._DOUBLE_SPACE_RE = re.compile(r"  +")
+InputSanitizer._NEWLINE_RUN_RE = re.compile(r"\n{3,}")
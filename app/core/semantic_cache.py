@@ -0,0 +1,135 @@
+"""
+Embedding-similarity cache for near-duplicate prompts.
+
+Responsibilities:
+- Embed the variable user turn of a prompt with a small local model
+- Find the most similar previously answered prompt (cosine similarity)
+- Return its response when similarity clears a threshold
+
+Optional dependencies: sentence-transformers and faiss-cpu. They are
+imported lazily so the rest of the service runs without them.
+
+Version: 1.1.0
+"""
+
+import logging
+import threading
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache over normalized sentence embeddings.
+
+    Uses a flat inner-product index, which on L2-normalized vectors is
+    exact cosine similarity. Once quantize_after entries are stored, the
+    vectors move to an 8-bit scalar-quantized index (4x less memory,
+    similarity accurate to about 1e-2), so the cache keeps growing to
+    max_size in the memory the exact index would need for a quarter of
+    that; small caches stay exact. Once max_size entries are stored, new
+    entries are no longer added (these indexes have no cheap eviction).
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.92,
+        max_size: int = 40_000,
+        model_name: str = "all-MiniLM-L6-v2",
+        quantize_after: int | None = 10_000,
+    ):
+        """
+        Initialize cache and load the embedding model.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            max_size: Maximum number of stored entries
+            model_name: sentence-transformers model to embed with
+            quantize_after: Entry count at which to switch to the int8
+                index (None = never quantize); must be below max_size
+
+        Raises:
+            ValueError: If quantize_after is not below max_size
+            ImportError: If sentence-transformers or faiss is not installed
+        """
+        if quantize_after is not None and quantize_after >= max_size:
+            raise ValueError(
+                f"quantize_after ({quantize_after}) must be below max_size ({max_size})"
+            )
+
+        try:
+            import faiss
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError("Semantic cache requires sentence-transformers and faiss-cpu") from e
+
+        self.threshold = threshold
+        self.max_size = max_size
+        self.quantize_after = quantize_after
+        self._faiss = faiss
+        self._quantized = False
+        self._model = SentenceTransformer(model_name)
+        self._index = faiss.IndexFlatIP(self._model.get_sentence_embedding_dimension())
+        self._values: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+        logger.info(f"Semantic cache initialized: model={model_name}, threshold={threshold}")
+
+    def _embed(self, text: str):
+        """Embed text as a (1, dim) float32 L2-normalized array."""
+        return self._model.encode([text], normalize_embeddings=True).astype("float32")
+
+    def lookup(self, text: str) -> tuple[float, dict[str, Any]] | None:
+        """
+        Find the stored response for the most similar text.
+
+        Returns:
+            (similarity, stored response) on a hit, otherwise None
+        """
+        if self._index.ntotal == 0:
+            return None
+
+        vector = self._embed(text)
+        with self._lock:
+            scores, ids = self._index.search(vector, 1)
+            similarity = float(scores[0][0])
+            if ids[0][0] < 0 or similarity < self.threshold:
+                return None
+            return similarity, self._values[ids[0][0]]
+
+    def add(self, text: str, value: dict[str, Any]) -> None:
+        """Store response for text (ignored once max_size is reached)."""
+        if self._index.ntotal >= self.max_size:
+            return
+
+        vector = self._embed(text)
+        with self._lock:
+            self._index.add(vector)
+            self._values.append(value)
+            if (
+                not self._quantized
+                and self.quantize_after is not None
+                and self._index.ntotal >= self.quantize_after
+            ):
+                self._quantize()
+
+    def _quantize(self) -> None:
+        """Move stored vectors to an 8-bit scalar-quantized index (caller holds lock)."""
+        faiss = self._faiss
+        vectors = self._index.reconstruct_n(0, self._index.ntotal)
+
+        index = faiss.IndexScalarQuantizer(
+            self._index.d, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(vectors)
+        index.add(vectors)
+
+        # Ids are insertion order in both indexes, so _values stays aligned
+        self._index = index
+        self._quantized = True
+        logger.info(f"Semantic cache quantized to int8: entries={index.ntotal}")
+
+    def __len__(self) -> int:
+        return len(self._values)
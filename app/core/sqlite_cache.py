@@ -0,0 +1,111 @@
+"""
+Persistent LLM response cache backed by SQLite.
+
+Responsibilities:
+- Store validated LLM responses keyed by prompt hash
+- Share hits across worker processes through one database file
+- Keep entries across restarts, expiring them after a time-to-live
+
+Uses WAL mode so readers in other workers never block on a writer.
+Same get/set interface as TTLCache, so GeminiClient can use either.
+
+Version: 1.0.0
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Expired/overflow rows are pruned once every this many writes
+_PRUNE_INTERVAL = 256
+
+
+class SQLiteCache:
+    """
+    Key/value cache of JSON-serializable dicts in a SQLite file.
+
+    Expiry uses wall-clock time, since entries are shared between
+    processes. Safe to use from several threads.
+    """
+
+    def __init__(self, path: str, *, max_size: int = 10_000, ttl_seconds: float = 900.0):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Database file path (created if missing)
+            max_size: Approximate maximum number of entries
+            ttl_seconds: Time after which an entry expires
+        """
+        self.path = path
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, response BLOB NOT NULL, created_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+
+        logger.info(f"SQLite response cache opened: path={path}")
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return cached value for key, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM llm_cache WHERE key = ? AND created_at > ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchone()
+        if row is None:
+            return None
+        value: dict[str, Any] = orjson.loads(row[0])
+        return value
+
+    def set(self, key: str, value: dict[str, Any]) -> None:
+        """Store value, pruning expired and excess entries periodically."""
+        blob = orjson.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+                (key, blob, time.time()),
+            )
+            self._writes += 1
+            if self._writes % _PRUNE_INTERVAL == 0:
+                self._prune()
+
+    def _prune(self) -> None:
+        """Delete expired rows, then the oldest rows beyond max_size (caller holds lock)."""
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE created_at <= ?", (time.time() - self.ttl_seconds,)
+        )
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_size,),
+        )
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        return int(count)
@@ -0,0 +1,70 @@
+"""
+In-process LRU cache with per-entry time-to-live.
+
+Used by the LLM client (exact-match prompt cache) and the analysis
+service (repeated-message cache).
+
+Thread-safe: batch analysis calls the shared LLM client's cache from
+several pool threads at once.
+
+Version: 1.0.0
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+# PEP 695 syntax (class TTLCache[V]) is a SyntaxError on 3.11, which the
+# test matrix still covers
+class TTLCache(Generic[V]):  # noqa: UP046
+    """
+    Least-recently-used cache whose entries expire after ttl_seconds.
+    """
+
+    def __init__(self, *, max_size: int = 1024, ttl_seconds: float = 900.0):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum number of entries
+            ttl_seconds: Time after which an entry expires
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> V | None:
+        """Return cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._entries.pop(key, None)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: V) -> None:
+        """Store value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
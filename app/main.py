@@ -14,6 +14,7 @@ Run with: uvicorn app.main:app --reload
 Version: 1.0.0
 """
 
+import asyncio
 import logging
 import sys
 import time
@@ -23,14 +24,16 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
+from fastapi.responses import ORJSONResponse
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api.routes import api_router
 from app.core.config import get_settings
+from app.core.limits import limiter
+from app.core.middleware import ContentLengthLimitMiddleware
+from app.core.structured_logging import JSONFormatter, RequestContextFilter, request_id_var
 
 
 # Configure logging (deferred until startup to avoid import-time settings loading)
@@ -58,20 +61,24 @@ def setup_logging(settings_override=None):
         )
         return
 
-    # Root logger configuration
-    logging.basicConfig(
-        level=getattr(logging, settings.log_level),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
-    )
+    # Structured JSON or plain text, both tagged with the current request ID
+    if settings.log_format == "json":
+        formatter: logging.Formatter = JSONFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    handlers: list[logging.Handler] = [logging.StreamHandler(sys.stdout)]
 
     # Add file handler if configured
     if settings.log_file:
-        file_handler = logging.FileHandler(settings.log_file)
-        file_handler.setFormatter(
-            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        )
-        logging.getLogger().addHandler(file_handler)
+        handlers.append(logging.FileHandler(settings.log_file))
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        handler.addFilter(RequestContextFilter())
+
+    # Root logger configuration
+    logging.basicConfig(level=getattr(logging, settings.log_level), handlers=handlers)
 
     # Reduce noise from external libraries
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -90,7 +97,7 @@ async def lifespan(app: FastAPI):
     Application lifespan manager.
 
     Handles startup and shutdown events:
-    - Startup: Load configuration, initialize logging, verify dependencies
+    - Startup: Load configuration, initialize logging, build shared analyzer
     - Shutdown: Cleanup resources
     """
     # Load settings and configure logging
@@ -105,11 +112,12 @@ async def lifespan(app: FastAPI):
     logger.info(f"API prefix: {settings.api_prefix}")
     logger.info(f"Rate limit: {settings.rate_limit_per_minute}/min")
 
-    # Verify LLM configuration
+    # Build the shared analyzer (and LLM client) once for all requests
+    app.state.analyzer = None
     try:
-        from app.core.llm_client import create_gemini_client
+        from app.services.analyzer import create_analyzer
 
-        _ = create_gemini_client()
+        app.state.analyzer = create_analyzer()
         logger.info(f"LLM client initialized: {settings.gemini_model}")
     except Exception as e:
         logger.error(f"LLM client initialization failed: {type(e).__name__}")
@@ -117,13 +125,57 @@ async def lifespan(app: FastAPI):
             raise  # Fail fast in production
         logger.warning("Continuing without LLM client (non-production environment)")
 
+    # Open the Gemini connection before the first request arrives
+    if settings.llm_warmup_enabled and app.state.analyzer is not None:
+        await app.state.analyzer.llm_client.warmup(timeout=settings.llm_warmup_timeout)
+
+    # Load the tokenizer and build the static prompt parts off the event loop
+    from app.core.prompt_templates import warmup_prompt_statics
+
+    await asyncio.to_thread(warmup_prompt_statics)
+
+    # Cache LLM results for repeated messages
+    app.state.analysis_cache = None
+    if settings.analysis_cache_enabled:
+        from app.services.cache import AnalysisCache
+
+        app.state.analysis_cache = AnalysisCache(
+            max_size=settings.analysis_cache_max_size,
+            ttl_seconds=settings.analysis_cache_ttl_seconds,
+        )
+
+    # Micro-batch concurrent analyze requests into shared LLM calls
+    app.state.batcher = None
+    if settings.batch_analysis_enabled and app.state.analyzer is not None:
+        from app.services.batcher import AnalysisBatcher
+
+        app.state.batcher = AnalysisBatcher(
+            app.state.analyzer,
+            max_batch_size=settings.batch_max_size,
+            max_wait_ms=settings.batch_max_wait_ms,
+            max_concurrent_batches=settings.batch_max_concurrency,
+        )
+        app.state.batcher.start()
+        logger.info(
+            f"Batch analysis enabled: max_size={settings.batch_max_size}, "
+            f"max_wait={settings.batch_max_wait_ms}ms"
+        )
+
     logger.info("Application startup complete")
 
     yield
 
     # Shutdown
     logger.info("Application shutdown initiated")
-    # Add cleanup logic here (close connections, etc.)
+    if app.state.batcher is not None:
+        await app.state.batcher.stop()
+        app.state.batcher = None
+    if app.state.analyzer is not None:
+        try:
+            await app.state.analyzer.llm_client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close LLM client: {type(e).__name__}")
+    app.state.analyzer = None
     logger.info("Application shutdown complete")
 
 
@@ -137,19 +189,24 @@ app = FastAPI(
     docs_url="/docs" if settings.debug else None,  # Disable docs in production
     redoc_url="/redoc" if settings.debug else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson encodes straight to bytes
 )
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address, storage_uri=settings.rate_limit_storage_uri)
+# Attach shared rate limiter
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # type: ignore[arg-type]
 
 
+# Reject oversize bodies before they are read (added before CORS so
+# 413 responses still carry CORS headers)
+app.add_middleware(ContentLengthLimitMiddleware, max_bytes=settings.max_request_size)
+
+
 # CORS middleware
 if settings.cors_enabled:
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.cors_origins,
+        allow_origins=settings.cors_origin_set,  # set lookup per request, not a list scan
         allow_credentials=settings.cors_allow_credentials,
         allow_methods=settings.cors_allow_methods,
         allow_headers=settings.cors_allow_headers,
@@ -157,23 +214,6 @@ if settings.cors_enabled:
     # Note: CORS configuration logged in lifespan startup
 
 
-# Request ID middleware
-@app.middleware("http")
-async def add_request_id(request: Request, call_next: Callable):
-    """
-    Add unique request ID to each request for tracking.
-
-    Request ID is available in logs and response headers.
-    """
-    request_id = f"{int(time.time() * 1000)}-{id(request)}"
-    request.state.request_id = request_id
-
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-
-    return response
-
-
 # Logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next: Callable):
@@ -182,13 +222,13 @@ async def log_requests(request: Request, call_next: Callable):
 
     Logs: method, path, status code, processing time
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
 
     # Process request
     response = await call_next(request)
 
     # Calculate processing time
-    process_time = (time.time() - start_time) * 1000
+    process_time = (time.perf_counter_ns() - start_ns) / 1e6
 
     # Log request (metadata only, no user data)
     request_logger = logging.getLogger(__name__)
@@ -204,6 +244,29 @@ async def log_requests(request: Request, call_next: Callable):
     return response
 
 
+# Request ID middleware (registered last so it is outermost and the
+# request ID is bound for every log record, including the access log)
+@app.middleware("http")
+async def add_request_id(request: Request, call_next: Callable):
+    """
+    Add unique request ID to each request for tracking.
+
+    Request ID is available in logs and response headers.
+    """
+    request_id = f"{int(time.time() * 1000)}-{id(request)}"
+    request.state.request_id = request_id
+
+    # Bound once here; log records pick it up without per-call arguments
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+
+    return response
+
+
 # Exception handlers
 
 
@@ -215,7 +278,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """
     # If detail is a dict with error info, use it directly
     if isinstance(exc.detail, dict):
-        return JSONResponse(status_code=exc.status_code, content=exc.detail)
+        return ORJSONResponse(status_code=exc.status_code, content=exc.detail)
     elif isinstance(exc.detail, str):
         detail_str = exc.detail
     else:
@@ -223,7 +286,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         detail_str = str(exc.detail) if exc.detail is not None else "Unknown error"
 
     # Wrap string detail in standard format
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -249,7 +312,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             }
         )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "success": False,
@@ -265,7 +328,7 @@ async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
     """
     Handle rate limit exceeded errors.
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         content={
             "success": False,
@@ -289,7 +352,7 @@ async def general_exception_handler(request: Request, exc: Exception):
         exc_info=True,
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
@@ -8,10 +8,30 @@ Version: 1.0.0
 
 import re
 from enum import Enum
+from functools import cache
 from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
+# Characters stripped from model_debug strings (code blocks, injection attempts)
+_MODEL_DEBUG_STRIP_RE = re.compile(r"[`{}\\\[\]]")
+
+# Keys allowed through into model_debug
+_SAFE_DEBUG_KEYS = frozenset(
+    {
+        "model",
+        "tokens",
+        "tokens_used",
+        "latency_ms",
+        "provider",
+        "fallback_used",
+        "temperature",
+    }
+)
+
+# Emotions that flag a message for attention regardless of stress score
+_CRITICAL_EMOTIONS = frozenset({"anger", "fear"})
+
 
 class SentimentEnum(str, Enum):
     """Sentiment classification options"""
@@ -155,26 +175,17 @@ class AnalyzeResponse(BaseModel):
             return v
 
         sanitized: dict[str, Any] = {}
-        SAFE_KEYS = {
-            "model",
-            "tokens",
-            "tokens_used",
-            "latency_ms",
-            "provider",
-            "fallback_used",
-            "temperature",
-        }
 
         for key, value in v.items():
             # Only allow safe keys
-            if key not in SAFE_KEYS:
+            if key not in _SAFE_DEBUG_KEYS:
                 continue
 
             # Sanitize string values: remove newlines, limit length
             if isinstance(value, str):
                 sanitized_val = value.replace("\n", " ").replace("\r", " ")
                 # Remove potential code blocks or injection attempts
-                sanitized_val = re.sub(r"[`{}\\\[\]]", "", sanitized_val)
+                sanitized_val = _MODEL_DEBUG_STRIP_RE.sub("", sanitized_val)
                 sanitized[key] = sanitized_val[:100]  # Limit length
             elif isinstance(value, (int, float, bool)):
                 sanitized[key] = value  # Preserve native types for numbers and bools
@@ -194,7 +205,8 @@ class AnalyzeResponse(BaseModel):
             urgency = values.get("urgency", False)
 
             high_stress = stress_score >= 8
-            critical_emotion = emotion in ["anger", "fear"]
+            # Raw input: an unhashable value must not reach the set lookup
+            critical_emotion = isinstance(emotion, str) and emotion in _CRITICAL_EMOTIONS
 
             if (high_stress or critical_emotion) and not urgency:
                 values["urgency"] = True
@@ -203,24 +215,37 @@ class AnalyzeResponse(BaseModel):
 
 
 def _remove_titles_recursive(obj: Any) -> Any:
-    """Recursively remove title fields from schema dict.
+    """Remove title fields from every dict in a nested schema, in place.
+
+    Walks the tree with an explicit stack, so no per-node copies are made.
 
     Args:
-        obj: Schema object (dict, list, or primitive)
+        obj: Schema object (dict, list, or primitive); modified in place
 
     Returns:
-        Cleaned object without title fields
+        The same object, without title fields
     """
-    if isinstance(obj, dict):
-        return {k: _remove_titles_recursive(v) for k, v in obj.items() if k != "title"}
-    elif isinstance(obj, list):
-        return [_remove_titles_recursive(item) for item in obj]
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            node.pop("title", None)
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        stack.extend(child for child in children if isinstance(child, (dict, list)))
     return obj
 
 
+@cache
 def get_clean_schema() -> dict[str, Any]:
     """Get JSON schema without title fields for cleaner LLM prompts.
 
+    The models are frozen, so the schema is built once per process; the
+    returned dict is shared and must not be mutated.
+
     Returns:
         Simplified schema suitable for inclusion in system prompts
     """
@@ -232,94 +257,31 @@ def get_clean_schema() -> dict[str, Any]:
     return result
 
 
-# JSON Schema export for LLM function-calling
-ANALYSIS_JSON_SCHEMA = {
-    "type": "object",
-    "properties": {
-        "sentiment": {
-            "type": "string",
-            "enum": ["positive", "negative", "neutral", "mixed"],
-            "description": "Overall sentiment of the message",
-        },
-        "emotion": {
-            "type": "string",
-            "enum": [
-                "joy",
-                "sadness",
-                "anger",
-                "fear",
-                "surprise",
-                "disgust",
-                "neutral",
-                "frustration",
-                "anxiety",
-                "excitement",
-            ],
-            "description": "Primary emotion detected",
-        },
-        "stress_score": {
-            "type": "integer",
-            "minimum": 0,
-            "maximum": 10,
-            "description": "Stress level (0=calm, 10=extreme stress)",
-        },
-        "category": {
-            "type": "string",
-            "enum": [
-                "workload",
-                "deadline",
-                "conflict",
-                "praise",
-                "feedback",
-                "question",
-                "update",
-                "blocker",
-                "support_request",
-                "general",
-            ],
-            "description": "Message category classification",
-        },
-        "key_phrases": {
-            "type": "array",
-            "items": {"type": "string", "maxLength": 200},
-            "maxItems": 10,
-            "description": "Important phrases extracted from message",
-        },
-        "suggested_reply": {
-            "type": "string",
-            "maxLength": 1000,
-            "description": "AI-suggested reply for manager/team lead",
-        },
-        "action_items": {
-            "type": "array",
-            "items": {"type": "string", "maxLength": 200},
-            "maxItems": 5,
-            "description": "Recommended action items",
-        },
-        "confidence_scores": {
-            "type": "object",
-            "properties": {
-                "sentiment": {"type": "number", "minimum": 0.0, "maximum": 1.0},
-                "emotion": {"type": "number", "minimum": 0.0, "maximum": 1.0},
-                "category": {"type": "number", "minimum": 0.0, "maximum": 1.0},
-                "stress": {"type": "number", "minimum": 0.0, "maximum": 1.0},
-            },
-            "required": ["sentiment", "emotion", "category", "stress"],
-            "additionalProperties": False,
-        },
-        "urgency": {
-            "type": "boolean",
-            "description": "Whether message requires immediate attention",
-        },
-        "schema_version": {"type": "string", "description": "Schema version for compatibility"},
-    },
-    "required": [
-        "sentiment",
-        "emotion",
-        "stress_score",
-        "category",
-        "confidence_scores",
-        "urgency",
-    ],
-    "additionalProperties": False,
-}
+def _inline_refs(obj: Any, defs: dict[str, Any]) -> Any:
+    """Copy a schema with every local "$ref" replaced by its definition."""
+    if isinstance(obj, dict):
+        ref = obj.get("$ref")
+        if ref is not None:
+            resolved = dict(defs[ref.rsplit("/", 1)[-1]])
+            resolved.update((k, v) for k, v in obj.items() if k != "$ref")
+            return _inline_refs(resolved, defs)
+        return {k: _inline_refs(v, defs) for k, v in obj.items() if k != "$defs"}
+    if isinstance(obj, list):
+        return [_inline_refs(item, defs) for item in obj]
+    return obj
+
+
+@cache
+def _analysis_json_schema() -> dict[str, Any]:
+    """Flat response schema (no $defs/$ref) for LLM function-calling."""
+    schema = get_clean_schema()
+    result: dict[str, Any] = _inline_refs(schema, schema.get("$defs", {}))
+    return result
+
+
+def __getattr__(name: str) -> Any:
+    # ANALYSIS_JSON_SCHEMA is derived from AnalyzeResponse on first access
+    # (PEP 562), so importing this module does not build the schema
+    if name == "ANALYSIS_JSON_SCHEMA":
+        return _analysis_json_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -13,22 +13,71 @@ Integration: Combines sanitizer, prompt_templates, and llm_client
 Version: 1.0.0
 """
 
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
-from app.core.llm_client import GeminiClient, create_gemini_client
+from app.core.llm_client import (
+    GeminiClient,
+    GeminiClientPool,
+    create_gemini_client,
+    create_gemini_client_pool,
+)
 from app.core.prompt_templates import PromptBuilder, PromptContext
-from app.core.sanitizer import InputSanitizer, ThreatLevel
+from app.core.sanitizer import InputSanitizer, SanitizationResult, ThreatLevel
 from app.schemas.analysis import AnalyzeRequest
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+# Upper bound on concurrent LLM calls made by analyze_batch
+_BATCH_MAX_WORKERS = 16
+
+# Analysis templates; hand out copies via _copy_analysis, since callers
+# annotate model_debug in place
+_BLOCKED_ANALYSIS: dict[str, Any] = {
+    "sentiment": "neutral",
+    "emotion": "neutral",
+    "stress_score": 0,
+    "category": "general",
+    "key_phrases": ["Content flagged by security filter"],
+    "suggested_reply": "This message has been flagged for review. Please contact support if you believe this is an error.",
+    "action_items": ["Review flagged content", "Contact security team"],
+    "confidence_scores": {"sentiment": 0.0, "emotion": 0.0, "category": 0.0, "stress": 0.0},
+    "urgency": True,
+    "model_debug": {"model": "security filter", "blocked": True},
+}
+
+_SAFE_FALLBACK: dict[str, Any] = {
+    "sentiment": "neutral",
+    "emotion": "neutral",
+    "stress_score": 5,
+    "category": "general",
+    "key_phrases": [],
+    "suggested_reply": "Thank you for your message. I'll review this and get back to you shortly.",
+    "action_items": ["Review message", "Follow up with sender"],
+    "confidence_scores": {"sentiment": 0.5, "emotion": 0.5, "category": 0.5, "stress": 0.5},
+    "urgency": False,
+    "model_debug": {
+        "model": "fallback",
+        "fallback_used": True,
+        "reason": "Pipeline failure",
+    },
+}
+
+
+def _copy_analysis(template: dict[str, Any]) -> dict[str, Any]:
+    """Copy an analysis template one level deep (its values are flat lists/dicts)."""
+    return {k: v.copy() if isinstance(v, (dict, list)) else v for k, v in template.items()}
+
+
+@dataclass(frozen=True, slots=True)
 class AnalysisResult:
     """
-    Complete analysis result with metadata.
+    Complete analysis result with metadata (fields cannot be reassigned).
 
     Attributes:
         analysis: Validated analysis dict matching AnalyzeResponse schema
@@ -58,13 +107,16 @@ class MessageAnalyzer:
     """
 
     def __init__(
-        self, gemini_client: GeminiClient | None = None, sanitizer: InputSanitizer | None = None
+        self,
+        gemini_client: GeminiClient | GeminiClientPool | None = None,
+        sanitizer: InputSanitizer | None = None,
     ):
         """
         Initialize analyzer with optional dependency injection.
 
         Args:
-            gemini_client: Pre-configured Gemini client (creates default if None)
+            gemini_client: Pre-configured Gemini client or client pool
+                (creates default if None)
             sanitizer: Pre-configured sanitizer (creates default if None)
         """
         self.llm_client = gemini_client or create_gemini_client()
@@ -96,19 +148,110 @@ class MessageAnalyzer:
             ValueError: If sanitization detects critical threat (optional)
             RuntimeError: If LLM fails and fallback disabled
         """
-        import time
+        start_ns = time.perf_counter_ns()
 
-        start_time = time.time()
+        # Steps 1-3: Sanitize, build context and prompt
+        prepared = self._prepare(
+            request, start_ns, include_examples=include_examples, max_examples=max_examples
+        )
+        if isinstance(prepared, AnalysisResult):
+            return prepared
+        sanitization_result, messages = prepared
 
-        # Step 1: Sanitize input
-        logger.info(f"Analyzing message: length={len(request.message)} chars")
+        # Step 4: Call LLM
+        try:
+            analysis_dict = self.llm_client.analyze(messages, fallback_on_error=fallback_on_error)
+            llm_used = self._annotate(analysis_dict, sanitization_result)
 
-        sanitization_result = self.sanitizer.sanitize(
-            request.message,
-            html_escape=False,  # LLM doesn't need HTML escaping
-            redact_pii=True,  # Protect user privacy
-            strict=False,  # Allow normal code mentions in workplace context
+        except Exception as e:
+            logger.error("Analysis pipeline failed: %s", e)
+
+            if fallback_on_error:
+                analysis_dict = self._generate_safe_fallback()
+                llm_used = False
+            else:
+                raise
+
+        # Steps 5-6: Calculate processing time and return result
+        return self._build_result(analysis_dict, sanitization_result, llm_used, start_ns)
+
+    async def analyze_async(
+        self,
+        request: AnalyzeRequest,
+        *,
+        include_examples: bool = True,
+        max_examples: int = 3,
+        fallback_on_error: bool = True,
+    ) -> AnalysisResult:
+        """
+        Analyze a message without blocking the event loop.
+
+        Same pipeline as analyze(), but awaits the LLM call so a single
+        worker can serve other requests while Gemini is responding.
+
+        Args:
+            request: Validated AnalyzeRequest with message and metadata
+            include_examples: Whether to include few-shot examples in prompt
+            max_examples: Maximum number of examples to include
+            fallback_on_error: Whether to use fallback response on LLM errors
+
+        Returns:
+            AnalysisResult with validated analysis and metadata
+
+        Raises:
+            RuntimeError: If LLM fails and fallback disabled
+        """
+        start_ns = time.perf_counter_ns()
+
+        # Regex-heavy sanitization runs in a worker thread so it can't stall
+        # other requests on the event loop
+        prepared = await asyncio.to_thread(
+            self._prepare,
+            request,
+            start_ns,
+            include_examples=include_examples,
+            max_examples=max_examples,
         )
+        if isinstance(prepared, AnalysisResult):
+            return prepared
+        sanitization_result, messages = prepared
+
+        try:
+            analysis_dict = await self.llm_client.aanalyze(
+                messages, fallback_on_error=fallback_on_error
+            )
+            llm_used = self._annotate(analysis_dict, sanitization_result)
+
+        except Exception as e:
+            logger.error("Analysis pipeline failed: %s", e)
+
+            if fallback_on_error:
+                analysis_dict = self._generate_safe_fallback()
+                llm_used = False
+            else:
+                raise
+
+        return self._build_result(analysis_dict, sanitization_result, llm_used, start_ns)
+
+    def _prepare(
+        self,
+        request: AnalyzeRequest,
+        start_ns: int,
+        *,
+        include_examples: bool,
+        max_examples: int,
+    ) -> AnalysisResult | tuple[SanitizationResult, list[dict[str, str]]]:
+        """
+        Sanitize the request and build the LLM prompt.
+
+        Returns:
+            Blocked AnalysisResult for critical threats, otherwise
+            (sanitization_result, prompt messages)
+        """
+        # Step 1: Sanitize input
+        logger.info("Analyzing message: length=%d chars", len(request.message))
+
+        sanitization_result = self._sanitize(request)
 
         sanitized_message = sanitization_result.sanitized_text
         threat_level = sanitization_result.threat_level
@@ -116,8 +259,7 @@ class MessageAnalyzer:
         # Log sanitization results
         if sanitization_result.detected_threats:
             logger.warning(
-                f"Threats detected: {sanitization_result.detected_threats}, "
-                f"level={threat_level}"
+                "Threats detected: %s, level=%s", sanitization_result.detected_threats, threat_level
             )
 
         # Optional: Block critical threats
@@ -125,19 +267,12 @@ class MessageAnalyzer:
             logger.error("Critical threat detected, blocking analysis")
             # Could raise exception here, but for now use fallback
             return self._create_blocked_result(
-                threat_level=threat_level, processing_time_ms=(time.time() - start_time) * 1000
+                threat_level=threat_level,
+                processing_time_ms=(time.perf_counter_ns() - start_ns) / 1e6,
             )
 
         # Step 2: Build prompt context
-        context = PromptContext(
-            message=sanitized_message,
-            sender_id=request.user_id,
-            metadata=(
-                {"channel_id": request.channel_id, **(request.context or {})}
-                if request.channel_id or request.context
-                else None
-            ),
-        )
+        context = self._build_context(request, sanitized_message)
 
         # Step 3: Build prompt with schema and examples
         messages = PromptBuilder.build_analysis_prompt(
@@ -148,51 +283,168 @@ class MessageAnalyzer:
         )
 
         logger.info(
-            f"Built prompt: messages={len(messages)}, "
-            f"examples={max_examples if include_examples else 0}"
+            "Built prompt: messages=%d, examples=%d",
+            len(messages),
+            max_examples if include_examples else 0,
         )
 
-        # Step 4: Call LLM
-        try:
-            analysis_dict = self.llm_client.analyze(messages, fallback_on_error=fallback_on_error)
+        return sanitization_result, messages
 
-            llm_used = not analysis_dict.get("model_debug", {}).get("fallback_used", False)
-
-            # Add metadata to model_debug
-            if "model_debug" not in analysis_dict:
-                analysis_dict["model_debug"] = {}
+    def _annotate(
+        self, analysis_dict: dict[str, Any], sanitization_result: SanitizationResult
+    ) -> bool:
+        """
+        Add sanitization metadata to model_debug.
 
-            analysis_dict["model_debug"]["sanitization_applied"] = bool(
-                sanitization_result.modifications_made
-            )
-            analysis_dict["model_debug"]["threat_level"] = threat_level.value
+        Returns:
+            Whether the LLM produced the analysis (vs fallback)
+        """
+        llm_used = not analysis_dict.get("model_debug", {}).get("fallback_used", False)
 
-            logger.info(
-                f"Analysis complete: llm_used={llm_used}, "
-                f"sentiment={analysis_dict.get('sentiment')}"
-            )
+        # Add metadata to model_debug
+        if "model_debug" not in analysis_dict:
+            analysis_dict["model_debug"] = {}
 
-        except Exception as e:
-            logger.error(f"Analysis pipeline failed: {str(e)}")
+        analysis_dict["model_debug"]["sanitization_applied"] = bool(
+            sanitization_result.modifications_made
+        )
+        analysis_dict["model_debug"]["threat_level"] = sanitization_result.threat_level.value
 
-            if fallback_on_error:
-                analysis_dict = self._generate_safe_fallback()
-                llm_used = False
-            else:
-                raise
+        logger.info(
+            "Analysis complete: llm_used=%s, sentiment=%s", llm_used, analysis_dict.get("sentiment")
+        )
+        return llm_used
 
-        # Step 5: Calculate processing time
-        processing_time_ms = (time.time() - start_time) * 1000
+    def _build_result(
+        self,
+        analysis_dict: dict[str, Any],
+        sanitization_result: SanitizationResult,
+        llm_used: bool,
+        start_ns: int,
+    ) -> AnalysisResult:
+        """Wrap an analysis dict in an AnalysisResult with timing."""
+        processing_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
-        # Step 6: Return result
         return AnalysisResult(
             analysis=analysis_dict,
             sanitization_applied=bool(sanitization_result.modifications_made),
-            threat_level=threat_level.value,
+            threat_level=sanitization_result.threat_level.value,
             llm_used=llm_used,
             processing_time_ms=processing_time_ms,
         )
 
+    def analyze_combined(
+        self,
+        requests: list[AnalyzeRequest],
+        *,
+        include_examples: bool = True,
+        max_examples: int = 3,
+        fallback_on_error: bool = True,
+    ) -> list[AnalysisResult]:
+        """
+        Analyze several messages with a single LLM call.
+
+        Each message is sanitized individually; critical threats are blocked
+        as in analyze(). The remaining messages share one batched prompt.
+
+        Args:
+            requests: List of AnalyzeRequest objects
+            include_examples: Whether to include few-shot examples in prompt
+            max_examples: Maximum number of examples to include
+            fallback_on_error: Whether to use fallback responses on LLM errors
+
+        Returns:
+            List of AnalysisResult objects (same order as input)
+
+        Raises:
+            RuntimeError: If LLM fails and fallback disabled
+        """
+        start_ns = time.perf_counter_ns()
+        results: list[AnalysisResult | None] = [None] * len(requests)
+        pending = []
+
+        for i, request in enumerate(requests):
+            sanitization_result = self._sanitize(request)
+            threat_level = sanitization_result.threat_level
+
+            if threat_level == ThreatLevel.CRITICAL:
+                logger.error("Critical threat detected, blocking analysis")
+                results[i] = self._create_blocked_result(
+                    threat_level=threat_level,
+                    processing_time_ms=(time.perf_counter_ns() - start_ns) / 1e6,
+                )
+                continue
+
+            context = self._build_context(request, sanitization_result.sanitized_text)
+            pending.append((i, sanitization_result, context))
+
+        if pending:
+            messages = PromptBuilder.build_batch_analysis_prompt(
+                [context for _, _, context in pending],
+                include_schema=True,
+                include_examples=include_examples,
+                max_examples=max_examples,
+            )
+
+            try:
+                analyses = self.llm_client.analyze_many(
+                    messages, len(pending), fallback_on_error=fallback_on_error
+                )
+            except Exception as e:
+                logger.error("Combined analysis failed: %s", type(e).__name__)
+                if not fallback_on_error:
+                    raise
+                analyses = [self._generate_safe_fallback() for _ in pending]
+
+            processing_time_ms = (time.perf_counter_ns() - start_ns) / 1e6
+
+            for (i, sanitization_result, _), analysis_dict in zip(pending, analyses, strict=True):
+                llm_used = not analysis_dict.get("model_debug", {}).get("fallback_used", False)
+                sanitization_applied = bool(sanitization_result.modifications_made)
+
+                analysis_dict.setdefault("model_debug", {})
+                analysis_dict["model_debug"]["sanitization_applied"] = sanitization_applied
+                analysis_dict["model_debug"][
+                    "threat_level"
+                ] = sanitization_result.threat_level.value
+
+                results[i] = AnalysisResult(
+                    analysis=analysis_dict,
+                    sanitization_applied=sanitization_applied,
+                    threat_level=sanitization_result.threat_level.value,
+                    llm_used=llm_used,
+                    processing_time_ms=processing_time_ms,
+                )
+
+        logger.info(
+            "Combined analysis complete: %d messages, %d sent to LLM", len(requests), len(pending)
+        )
+        return results  # type: ignore[return-value]
+
+    def _sanitize(self, request: AnalyzeRequest) -> SanitizationResult:
+        """Sanitize the request message for LLM input."""
+        return self.sanitizer.sanitize(
+            request.message,
+            html_escape=False,  # LLM doesn't need HTML escaping
+            redact_pii=True,  # Protect user privacy
+            strict=False,  # Allow normal code mentions in workplace context
+        )
+
+    def _build_context(self, request: AnalyzeRequest, sanitized_message: str) -> PromptContext:
+        """Build prompt context from the request metadata."""
+        metadata = None
+        if request.context:
+            # Context keys take precedence over channel_id, as before
+            metadata = dict(request.context)
+            if request.channel_id:
+                metadata.setdefault("channel_id", request.channel_id)
+        elif request.channel_id:
+            metadata = {"channel_id": request.channel_id}
+
+        return PromptContext(
+            message=sanitized_message, sender_id=request.user_id, metadata=metadata
+        )
+
     def _create_blocked_result(
         self, threat_level: ThreatLevel, processing_time_ms: float
     ) -> AnalysisResult:
@@ -206,22 +458,8 @@ class MessageAnalyzer:
         Returns:
             AnalysisResult indicating blocked content
         """
-        blocked_analysis = {
-            "sentiment": "neutral",
-            "emotion": "neutral",
-            "stress_score": 0,
-            "category": "general",
-            "key_phrases": ["Content flagged by security filter"],
-            "suggested_reply": "This message has been flagged for review. Please contact support if you believe this is an error.",
-            "action_items": ["Review flagged content", "Contact security team"],
-            "confidence_scores": {"sentiment": 0.0, "emotion": 0.0, "category": 0.0, "stress": 0.0},
-            "urgency": True,
-            "model_debug": {
-                "model": "security filter",
-                "threat_level": threat_level.value,
-                "blocked": True,
-            },
-        }
+        blocked_analysis = _copy_analysis(_BLOCKED_ANALYSIS)
+        blocked_analysis["model_debug"]["threat_level"] = threat_level.value
 
         return AnalysisResult(
             analysis=blocked_analysis,
@@ -238,27 +476,16 @@ class MessageAnalyzer:
         Returns:
             Dict matching AnalyzeResponse schema
         """
-        return {
-            "sentiment": "neutral",
-            "emotion": "neutral",
-            "stress_score": 5,
-            "category": "general",
-            "key_phrases": [],
-            "suggested_reply": "Thank you for your message. I'll review this and get back to you shortly.",
-            "action_items": ["Review message", "Follow up with sender"],
-            "confidence_scores": {"sentiment": 0.5, "emotion": 0.5, "category": 0.5, "stress": 0.5},
-            "urgency": False,
-            "model_debug": {
-                "model": "fallback",
-                "fallback_used": True,
-                "reason": "Pipeline failure",
-            },
-        }
+        return _copy_analysis(_SAFE_FALLBACK)
 
     def analyze_batch(self, requests: list[AnalyzeRequest], **kwargs) -> list[AnalysisResult]:
         """
         Analyze multiple messages in batch.
 
+        Messages are analyzed concurrently on a thread pool (the LLM call is
+        network-bound), so wall time is close to the slowest message rather
+        than the sum of all of them.
+
         Args:
             requests: List of AnalyzeRequest objects
             **kwargs: Additional arguments passed to analyze()
@@ -266,28 +493,30 @@ class MessageAnalyzer:
         Returns:
             List of AnalysisResult objects (same order as input)
         """
-        results = []
+        if not requests:
+            return []
 
-        for i, request in enumerate(requests):
-            logger.info(f"Processing batch item {i+1}/{len(requests)}")
+        def analyze_item(i: int, request: AnalyzeRequest) -> AnalysisResult:
+            logger.info("Processing batch item %d/%d", i + 1, len(requests))
 
             try:
-                result = self.analyze(request, **kwargs)
-                results.append(result)
+                return self.analyze(request, **kwargs)
             except Exception as e:
-                logger.error(f"Batch item {i+1} failed: {str(e)}")
+                logger.error("Batch item %d failed: %s", i + 1, e)
 
                 # Add error result
-                error_result = AnalysisResult(
+                return AnalysisResult(
                     analysis=self._generate_safe_fallback(),
                     sanitization_applied=False,
                     threat_level="unknown",
                     llm_used=False,
                     processing_time_ms=0.0,
                 )
-                results.append(error_result)
 
-        logger.info(f"Batch processing complete: {len(results)}/{len(requests)} successful")
+        with ThreadPoolExecutor(max_workers=min(len(requests), _BATCH_MAX_WORKERS)) as executor:
+            results = list(executor.map(analyze_item, range(len(requests)), requests))
+
+        logger.info("Batch processing complete: %d/%d successful", len(results), len(requests))
         return results
 
 
@@ -302,6 +531,13 @@ def create_analyzer(api_key: str | None = None, model_name: str | None = None) -
 
     Returns:
         Configured MessageAnalyzer
+
+    When no api_key is given and GEMINI_API_KEYS lists several keys,
+    calls are spread across them with a GeminiClientPool.
     """
-    client = create_gemini_client(api_key=api_key, model_name=model_name)
+    client: GeminiClient | GeminiClientPool
+    if api_key is None and "," in os.getenv("GEMINI_API_KEYS", ""):
+        client = create_gemini_client_pool(model_name=model_name)
+    else:
+        client = create_gemini_client(api_key=api_key, model_name=model_name)
     return MessageAnalyzer(gemini_client=client)
@@ -0,0 +1,161 @@
+"""
+Micro-batching of concurrent analysis requests.
+
+Responsibilities:
+- Collect analyze requests arriving within a short window
+- Dispatch each group as a single batched LLM call
+- Resolve each caller's future with its own AnalysisResult
+
+Trade-off: callers may wait up to max_wait_ms for a batch to fill, in
+exchange for one LLM round-trip per batch instead of one per message.
+
+Batches run on the batcher's own bounded thread pool, so blocking LLM
+calls never occupy the default executor that request handlers use for
+short offloads (sanitization, cache I/O).
+
+Version: 1.0.0
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from app.schemas.analysis import AnalyzeRequest
+from app.services.analyzer import AnalysisResult, MessageAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisBatcher:
+    """
+    Async micro-batcher in front of MessageAnalyzer.analyze_combined.
+
+    A background task drains the queue, waiting at most max_wait_ms after
+    the first queued request or until max_batch_size requests are ready.
+    """
+
+    def __init__(
+        self,
+        analyzer: MessageAnalyzer,
+        *,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+        max_concurrent_batches: int = 4,
+    ):
+        """
+        Initialize batcher.
+
+        Args:
+            analyzer: Analyzer used to process each batch
+            max_batch_size: Maximum number of requests per LLM call
+            max_wait_ms: Maximum time to wait for a batch to fill
+            max_concurrent_batches: Maximum number of batches running at once
+        """
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self._queue: asyncio.Queue[tuple[AnalyzeRequest, asyncio.Future]] = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches, thread_name_prefix="analysis-batch"
+        )
+
+    def start(self) -> None:
+        """Start the background collection task (idempotent)."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop collecting and wait for all accepted requests to finish.
+
+        Requests collected or still queued when the worker is cancelled are
+        dispatched rather than dropped, so no submit() caller is left waiting.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._dispatch_all(pending)
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, request: AnalyzeRequest) -> AnalysisResult:
+        """
+        Queue a request and wait for its result.
+
+        Args:
+            request: Validated AnalyzeRequest
+
+        Returns:
+            AnalysisResult for this request
+
+        Raises:
+            Exception: Propagates errors raised while processing the batch
+        """
+        self.start()
+        future: asyncio.Future[AnalysisResult] = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Collect batches from the queue and dispatch them."""
+        loop = asyncio.get_running_loop()
+        batch: list[tuple[AnalyzeRequest, asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_wait_s
+
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except TimeoutError:
+                        break
+
+                self._dispatch_all(batch)
+                batch = []
+        except asyncio.CancelledError:
+            # Stopped mid-collection: still run the requests already taken
+            self._dispatch_all(batch)
+            raise
+
+    def _dispatch_all(self, requests: list[tuple[AnalyzeRequest, asyncio.Future]]) -> None:
+        """Dispatch requests in max_batch_size chunks without waiting for them."""
+        for start in range(0, len(requests), self.max_batch_size):
+            # Dispatch without blocking collection of the next batch
+            task = asyncio.create_task(
+                self._dispatch(requests[start : start + self.max_batch_size])
+            )
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: list[tuple[AnalyzeRequest, asyncio.Future]]) -> None:
+        """Run one batch through the analyzer and resolve its futures."""
+        requests = [request for request, _ in batch]
+        logger.info("Dispatching analysis batch: size=%d", len(requests))
+
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.analyzer.analyze_combined, requests
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,52 @@
+"""
+In-process cache of analysis results.
+
+Responsibilities:
+- Key requests by a hash of the normalized message and its metadata
+- Keep recent results in an LRU with a time-to-live
+- Skip the LLM entirely for repeated messages ("thanks!", "great job")
+
+Only results produced by the LLM are cached; fallbacks and blocked
+messages are always recomputed.
+
+Version: 1.0.0
+"""
+
+import json
+from hashlib import blake2b
+
+from app.core.ttl_cache import TTLCache
+from app.schemas.analysis import AnalyzeRequest
+from app.services.analyzer import AnalysisResult
+
+
+class AnalysisCache(TTLCache[AnalysisResult]):
+    """
+    Exact-match LRU cache with TTL for AnalysisResult objects.
+
+    Not thread-safe: intended to be used from the event loop only.
+    """
+
+    @staticmethod
+    def make_key(request: AnalyzeRequest) -> str:
+        """
+        Build cache key for a request.
+
+        Whitespace is collapsed but case is kept, since capitalization can
+        change the analysis (e.g. "URGENT"). Channel and context metadata
+        are part of the key because they are rendered into the prompt; the
+        sender is not, so the same message shares a key across senders.
+        """
+        normalized = " ".join(request.message.split())
+        scope = json.dumps([request.channel_id, request.context], sort_keys=True, default=str)
+        digest = blake2b(digest_size=16)
+        digest.update(normalized.encode())
+        digest.update(b"\x00")
+        digest.update(scope.encode())
+        return digest.hexdigest()
+
+    def set(self, key: str, result: AnalysisResult) -> None:
+        """Store result if it came from the LLM."""
+        if not result.llm_used:
+            return
+        super().set(key, result)
@@ -12,7 +12,7 @@ Tests:
 - Error scenarios
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 
 from app.services.analyzer import (
     MessageAnalyzer,
@@ -226,6 +226,54 @@ class TestAnalyze:
         with pytest.raises(RuntimeError):
             analyzer.analyze(request, fallback_on_error=False)
 
+    
+    async def test_analyze_async_awaits_llm(self):
+        """Async pipeline should await the client's async analysis"""
+        mock_client = Mock()
+        mock_client.aanalyze = AsyncMock(return_value={
+            "sentiment": "negative",
+            "emotion": "frustration",
+            "stress_score": 6,
+            "category": "complaint",
+            "key_phrases": [],
+            "confidence_scores": {
+                "sentiment": 0.8,
+                "emotion": 0.7,
+                "category": 0.75,
+                "stress": 0.7
+            },
+            "urgency": False,
+            "model_debug": {"fallback_used": False}
+        })
+        
+        analyzer = MessageAnalyzer(gemini_client=mock_client)
+        result = await analyzer.analyze_async(AnalyzeRequest(message="This is frustrating"))
+        
+        assert result.llm_used is True
+        assert result.analysis["sentiment"] == "negative"
+        assert "threat_level" in result.analysis["model_debug"]
+        mock_client.aanalyze.assert_awaited_once()
+        mock_client.analyze.assert_not_called()
+    
+    async def test_analyze_async_sanitizes_off_event_loop(self):
+        """Sanitization should run in a worker thread"""
+        import threading
+        
+        mock_client = Mock()
+        mock_client.aanalyze = AsyncMock(return_value={"model_debug": {"fallback_used": True}})
+        analyzer = MessageAnalyzer(gemini_client=mock_client)
+        
+        real_sanitize = analyzer.sanitizer.sanitize
+        threads = []
+        
+        def recording_sanitize(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return real_sanitize(*args, **kwargs)
+        
+        analyzer.sanitizer.sanitize = recording_sanitize
+        await analyzer.analyze_async(AnalyzeRequest(message="Hello team"))
+        
+        assert threads and threads[0] != threading.get_ident()
 
 class TestPromptBuilding:
     """Test prompt building integration"""
@@ -280,6 +328,22 @@ class TestPromptBuilding:
         assert context.metadata is not None
         assert context.metadata["channel_id"] == "channel456"
         assert context.metadata["team"] == "engineering"
+    
+    def test_context_metadata_variants(self):
+        """Should only include metadata fields that were provided"""
+        analyzer = MessageAnalyzer(gemini_client=Mock())
+        
+        plain = analyzer._build_context(AnalyzeRequest(message="Hi"), "Hi")
+        context_only = analyzer._build_context(
+            AnalyzeRequest(message="Hi", context={"team": "eng"}), "Hi"
+        )
+        channel_only = analyzer._build_context(
+            AnalyzeRequest(message="Hi", channel_id="c1"), "Hi"
+        )
+        
+        assert plain.metadata is None
+        assert context_only.metadata == {"team": "eng"}
+        assert channel_only.metadata == {"channel_id": "c1"}
 
 
 class TestBatchProcessing:
@@ -329,30 +393,42 @@ class TestBatchProcessing:
     def test_batch_handles_individual_failures(self, mock_create_client):
         """Should handle failures in batch gracefully"""
         mock_client = Mock()
-        # First call succeeds, second fails, third succeeds
-        mock_client.analyze.side_effect = [
-            {"sentiment": "positive", "emotion": "joy", "stress_score": 2,
-             "category": "feedback", "key_phrases": [],
-             "confidence_scores": {"sentiment": 0.9, "emotion": 0.85,
-                                   "category": 0.8, "stress": 0.75},
-             "urgency": False},
-            Exception("API Error"),
-            {"sentiment": "negative", "emotion": "sadness", "stress_score": 7,
-             "category": "workload", "key_phrases": [],
-             "confidence_scores": {"sentiment": 0.85, "emotion": 0.8,
-                                   "category": 0.75, "stress": 0.9},
-             "urgency": True},
-        ]
+        # First message succeeds, second fails, third succeeds. Items run
+        # concurrently, so responses are chosen by message, not call order
+        responses = {
+            "Message 1": {"sentiment": "positive", "emotion": "joy", "stress_score": 2,
+                          "category": "feedback", "key_phrases": [],
+                          "confidence_scores": {"sentiment": 0.9, "emotion": 0.85,
+                                                "category": 0.8, "stress": 0.75},
+                          "urgency": False},
+            "Message 2": Exception("API Error"),
+            "Message 3": {"sentiment": "negative", "emotion": "sadness", "stress_score": 7,
+                          "category": "workload", "key_phrases": [],
+                          "confidence_scores": {"sentiment": 0.85, "emotion": 0.8,
+                                                "category": 0.75, "stress": 0.9},
+                          "urgency": True},
+        }
+        
+        def analyze(messages, **kwargs):
+            response = next(v for k, v in responses.items() if k in messages[-1]["content"])
+            if isinstance(response, Exception):
+                raise response
+            return dict(response)
+        
+        mock_client.analyze.side_effect = analyze
         mock_create_client.return_value = mock_client
         
         analyzer = MessageAnalyzer()
         
-        mock_sanitization = Mock()
-        mock_sanitization.sanitized_text = "Test"
-        mock_sanitization.threat_level = ThreatLevel.NONE
-        mock_sanitization.detected_threats = []
-        mock_sanitization.modifications_made = []
-        analyzer.sanitizer.sanitize = Mock(return_value=mock_sanitization)
+        def sanitize(text, **kwargs):
+            mock_sanitization = Mock()
+            mock_sanitization.sanitized_text = text
+            mock_sanitization.threat_level = ThreatLevel.NONE
+            mock_sanitization.detected_threats = []
+            mock_sanitization.modifications_made = []
+            return mock_sanitization
+        
+        analyzer.sanitizer.sanitize = Mock(side_effect=sanitize)
         
         requests = [
             AnalyzeRequest(message="Message 1", user_id="user1"),
@@ -367,6 +443,139 @@ class TestBatchProcessing:
         assert results[0].analysis["sentiment"] == "positive"
         assert results[1].llm_used is False  # Failed, used fallback
         assert results[2].analysis["sentiment"] == "negative"
+    
+    def test_batch_items_run_concurrently(self):
+        """Should have every LLM call in flight at once"""
+        import threading
+        
+        barrier = threading.Barrier(3, timeout=5)
+        mock_client = Mock()
+        
+        def analyze(messages, **kwargs):
+            barrier.wait()  # Breaks (and falls back) if calls are serial
+            return {"model_debug": {"fallback_used": False}}
+        
+        mock_client.analyze.side_effect = analyze
+        analyzer = MessageAnalyzer(gemini_client=mock_client)
+        
+        results = analyzer.analyze_batch(
+            [AnalyzeRequest(message=f"Message {i}") for i in range(3)]
+        )
+        
+        assert [r.llm_used for r in results] == [True, True, True]
+    
+    @patch('app.core.llm_client.genai_client.get_default_generative_async_client')
+    @patch('app.core.llm_client.genai_client.get_default_generative_client')
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_batch_shares_real_response_cache(self, mock_model_class, *_):
+        """Concurrent items should share the client's TTLCache without errors"""
+        import json
+        
+        from app.core import llm_client
+        from app.core.llm_client import GeminiClient, LLMConfig
+        from app.core.ttl_cache import TTLCache
+        
+        mock_response = Mock()
+        mock_response.text = json.dumps({
+            "sentiment": "positive",
+            "emotion": "joy",
+            "stress_score": 2,
+            "category": "praise",
+            "confidence_scores": {
+                "sentiment": 0.9,
+                "emotion": 0.85,
+                "category": 0.8,
+                "stress": 0.75
+            },
+            "urgency": False
+        })
+        mock_response.candidates = []
+        mock_model_class.return_value.generate_content.return_value = mock_response
+        
+        llm_client._reset_sdk_state()
+        try:
+            # A tiny cache keeps every thread evicting while others read
+            client = GeminiClient(LLMConfig(api_key="test_key", response_cache_size=2))
+            assert isinstance(client._response_cache, TTLCache)
+            analyzer = MessageAnalyzer(gemini_client=client)
+            
+            results = analyzer.analyze_batch(
+                [AnalyzeRequest(message=f"Message {i % 8}") for i in range(64)]
+            )
+        finally:
+            llm_client._reset_sdk_state()
+        
+        assert all(r.llm_used for r in results)
+
+
+class TestCombinedAnalysis:
+    """Test analyzing several messages with one LLM call"""
+    
+    def test_combined_single_llm_call(self):
+        """Should make one LLM call and keep input order"""
+        analysis = {
+            "sentiment": "positive",
+            "emotion": "joy",
+            "stress_score": 2,
+            "category": "feedback",
+            "key_phrases": [],
+            "confidence_scores": {
+                "sentiment": 0.9,
+                "emotion": 0.85,
+                "category": 0.8,
+                "stress": 0.75
+            },
+            "urgency": False,
+            "model_debug": {"fallback_used": False}
+        }
+        mock_client = Mock()
+        mock_client.analyze_many.side_effect = lambda messages, count, **kw: [
+            {**analysis, "model_debug": {"fallback_used": False}} for _ in range(count)
+        ]
+        
+        analyzer = MessageAnalyzer(gemini_client=mock_client)
+        requests = [
+            AnalyzeRequest(message="Message 1"),
+            AnalyzeRequest(message="Message 2"),
+        ]
+        
+        results = analyzer.analyze_combined(requests)
+        
+        assert len(results) == 2
+        assert all(r.llm_used for r in results)
+        mock_client.analyze_many.assert_called_once()
+        assert mock_client.analyze_many.call_args[0][1] == 2
+    
+    def test_combined_blocks_critical_threats(self):
+        """Critical threats should be blocked without reaching the LLM"""
+        mock_client = Mock()
+        analyzer = MessageAnalyzer(gemini_client=mock_client)
+        
+        mock_sanitization = Mock()
+        mock_sanitization.sanitized_text = "Dangerous content"
+        mock_sanitization.threat_level = ThreatLevel.CRITICAL
+        mock_sanitization.detected_threats = ["code_injection"]
+        mock_sanitization.modifications_made = []
+        analyzer.sanitizer.sanitize = Mock(return_value=mock_sanitization)
+        
+        results = analyzer.analyze_combined([AnalyzeRequest(message="bad")])
+        
+        assert results[0].threat_level == "critical"
+        assert results[0].analysis["model_debug"]["threat_level"] == "critical"
+        mock_client.analyze_many.assert_not_called()
+    
+    def test_fallback_results_are_independent(self):
+        """Annotating one fallback must not leak into the next"""
+        analyzer = MessageAnalyzer(gemini_client=Mock())
+        
+        first = analyzer._generate_safe_fallback()
+        first["model_debug"]["threat_level"] = "high"
+        first["action_items"].append("Escalate")
+        second = analyzer._generate_safe_fallback()
+        
+        assert "threat_level" not in second["model_debug"]
+        assert second["action_items"] == ["Review message", "Follow up with sender"]
 
 
 class TestFactoryFunction:
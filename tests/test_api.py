@@ -17,13 +17,15 @@ Test coverage:
 
 Version: 1.0.0
 """
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.schemas.analysis import AnalyzeRequest
 from app.services.analyzer import AnalysisResult
+from app.services.cache import AnalysisCache
 
 
 @pytest.fixture
@@ -32,11 +34,24 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def reset_shared_analyzer():
+    """Clear the cached analyzer, result cache and readiness probe between tests"""
+    app.state.analyzer = None
+    app.state.analysis_cache = None
+    app.state.llm_probe = None
+    yield
+    app.state.analyzer = None
+    app.state.analysis_cache = None
+    app.state.llm_probe = None
+
+
 @pytest.fixture
 def mock_analyzer():
     """Mock MessageAnalyzer for testing"""
     with patch('app.api.analyze.create_analyzer') as mock_create:
         analyzer = Mock()
+        analyzer.analyze_async = AsyncMock()
         mock_create.return_value = analyzer
         yield analyzer
 
@@ -69,6 +84,16 @@ class TestHealthEndpoints:
         assert "version" in data
         assert "environment" in data
     
+    def test_health_check_body_matches_model(self, client):
+        """Pre-serialized health body should match HealthResponse"""
+        from app.api.health import HealthResponse
+
+        response = client.get("/health")
+
+        assert response.headers["content-type"] == "application/json"
+        health = HealthResponse(**response.json())
+        assert isinstance(health.timestamp, float)
+
     def test_liveness_check(self, client):
         """Should return 200 OK for liveness check"""
         response = client.get("/health/live")
@@ -89,6 +114,40 @@ class TestHealthEndpoints:
             assert "checks" in data
             assert data["checks"]["configuration"]["status"] == "healthy"
     
+    def test_readiness_probe_cached(self, client):
+        """Repeated probes should reuse the last LLM check"""
+        with patch('app.api.health.create_gemini_client') as mock_create:
+            client.get("/health/ready")
+            response = client.get("/health/ready")
+            
+            assert response.status_code == 200
+            assert mock_create.call_count == 1
+    
+    def test_readiness_uses_shared_analyzer(self, client):
+        """Should not build a client when the shared analyzer exists"""
+        app.state.analyzer = Mock()
+        with patch('app.api.health.create_gemini_client') as mock_create:
+            response = client.get("/health/ready")
+            
+            assert response.status_code == 200
+            mock_create.assert_not_called()
+    
+    def test_readiness_check_timeout(self, client):
+        """A hanging dependency check should report not ready, not hang"""
+        import time
+
+        from app.core.config import Settings, get_settings
+        
+        app.dependency_overrides[get_settings] = lambda: Settings(HEALTH_CHECK_TIMEOUT=0)
+        try:
+            with patch('app.api.health._probe_llm_service', side_effect=lambda *a: time.sleep(0.2)):
+                response = client.get("/health/ready")
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 503
+        assert response.json()["checks"]["llm_service"]["message"] == "Check timed out"
+    
     @patch.dict('os.environ', {}, clear=True)
     def test_readiness_check_unhealthy(self, client):
         """Should return 503 when dependencies are not ready"""
@@ -131,7 +190,7 @@ class TestAnalyzeEndpoint:
             llm_used=True,
             processing_time_ms=1234.56
         )
-        mock_analyzer.analyze.return_value = mock_result
+        mock_analyzer.analyze_async.return_value = mock_result
         
         # Make request
         response = client.post(
@@ -183,7 +242,7 @@ class TestAnalyzeEndpoint:
             llm_used=True,
             processing_time_ms=1000.0
         )
-        mock_analyzer.analyze.return_value = mock_result
+        mock_analyzer.analyze_async.return_value = mock_result
         
         response = client.post(
             "/api/v1/analyze",
@@ -201,7 +260,7 @@ class TestAnalyzeEndpoint:
         assert response.status_code == 200
         data = response.json()
         assert data["success"] is True
-        assert mock_analyzer.analyze.called
+        assert mock_analyzer.analyze_async.called
     
     def test_empty_message_rejected(self, client):
         """Should reject empty message with 422"""
@@ -263,9 +322,55 @@ class TestAnalyzeEndpoint:
             assert data["success"] is False
             assert data["error"] == "service_unavailable"
     
+    def test_analyzer_created_once(self, client):
+        """Should reuse the shared analyzer across requests"""
+        with patch('app.api.analyze.create_analyzer') as mock_create:
+            mock_create.return_value.analyze_async = AsyncMock(side_effect=ValueError("Invalid input"))
+
+            for _ in range(2):
+                client.post("/api/v1/analyze", json={"message": "Test message"})
+
+            assert mock_create.call_count == 1
+
+    def test_repeated_message_served_from_cache(self, client, mock_analyzer):
+        """Identical messages should only reach the analyzer once"""
+        app.state.analysis_cache = AnalysisCache()
+        mock_analyzer.analyze_async.return_value = AnalysisResult(
+            analysis={
+                "sentiment": "positive",
+                "emotion": "joy",
+                "stress_score": 1,
+                "category": "praise",
+                "key_phrases": [],
+                "confidence_scores": {
+                    "sentiment": 0.9,
+                    "emotion": 0.9,
+                    "category": 0.9,
+                    "stress": 0.9
+                },
+                "urgency": False,
+                "model_debug": {"fallback_used": False}
+            },
+            sanitization_applied=False,
+            threat_level="low",
+            llm_used=True,
+            processing_time_ms=10.0
+        )
+        
+        first = client.post("/api/v1/analyze", json={"message": "thanks!"})
+        second = client.post("/api/v1/analyze", json={"message": "  thanks! "})
+        
+        assert first.json()["llm_used"] is True
+        assert first.json()["cached"] is False
+        assert second.status_code == 200
+        assert second.json()["llm_used"] is True
+        assert second.json()["cached"] is True
+        assert second.json()["analysis"]["sentiment"] == "positive"
+        assert mock_analyzer.analyze_async.call_count == 1
+    
     def test_analysis_validation_error(self, client, mock_analyzer):
         """Should return 422 when analysis validation fails"""
-        mock_analyzer.analyze.side_effect = ValueError("Invalid input")
+        mock_analyzer.analyze_async.side_effect = ValueError("Invalid input")
         
         response = client.post(
             "/api/v1/analyze",
@@ -279,7 +384,7 @@ class TestAnalyzeEndpoint:
     
     def test_internal_server_error(self, client, mock_analyzer):
         """Should return 500 for unexpected errors"""
-        mock_analyzer.analyze.side_effect = RuntimeError("Unexpected error")
+        mock_analyzer.analyze_async.side_effect = RuntimeError("Unexpected error")
         
         response = client.post(
             "/api/v1/analyze",
@@ -319,7 +424,7 @@ class TestAnalyzeEndpoint:
             llm_used=False,
             processing_time_ms=50.0
         )
-        mock_analyzer.analyze.return_value = mock_result
+        mock_analyzer.analyze_async.return_value = mock_result
         
         response = client.post(
             "/api/v1/analyze",
@@ -380,6 +485,15 @@ class TestRequestHeaders:
 class TestRateLimiting:
     """Test rate limiting"""
     
+    def test_rate_limit_from_settings(self):
+        """Analyze limit should come from RATE_LIMIT_PER_MINUTE"""
+        from app.core.config import get_settings
+        from app.core.limits import ANALYZE_RATE_LIMIT, limiter
+        
+        settings = get_settings()
+        assert ANALYZE_RATE_LIMIT == f"{settings.rate_limit_per_minute}/minute"
+        assert limiter.enabled is settings.rate_limit_enabled
+    
     def test_rate_limit_not_exceeded_normally(self, client, mock_analyzer):
         """Should allow requests under rate limit"""
         mock_result = AnalysisResult(
@@ -404,7 +518,7 @@ class TestRateLimiting:
             llm_used=True,
             processing_time_ms=100.0
         )
-        mock_analyzer.analyze.return_value = mock_result
+        mock_analyzer.analyze_async.return_value = mock_result
         
         # Make a few requests (under limit)
         for _ in range(3):
@@ -0,0 +1,118 @@
+"""
+Tests for the analysis micro-batcher.
+
+Tests:
+- Concurrent submissions grouped into one batch
+- Batch size limit
+- Error propagation to callers
+- Dedicated thread pool for batch calls
+- Pending requests resolved on stop
+"""
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from app.schemas.analysis import AnalyzeRequest
+from app.services.batcher import AnalysisBatcher
+
+
+def _fake_combined(requests):
+    """Echo each request message back as its result"""
+    return [request.message for request in requests]
+
+
+class TestAnalysisBatcher:
+    """Test request grouping and result routing"""
+    
+    async def test_groups_concurrent_requests(self):
+        """Concurrent submissions should share one analyzer call"""
+        analyzer = Mock()
+        analyzer.analyze_combined.side_effect = _fake_combined
+        batcher = AnalysisBatcher(analyzer, max_batch_size=8, max_wait_ms=50)
+        
+        results = await asyncio.gather(
+            *(batcher.submit(AnalyzeRequest(message=f"msg {i}")) for i in range(3))
+        )
+        await batcher.stop()
+        
+        assert results == ["msg 0", "msg 1", "msg 2"]
+        analyzer.analyze_combined.assert_called_once()
+    
+    async def test_respects_max_batch_size(self):
+        """Batches should never exceed max_batch_size"""
+        analyzer = Mock()
+        analyzer.analyze_combined.side_effect = _fake_combined
+        batcher = AnalysisBatcher(analyzer, max_batch_size=2, max_wait_ms=50)
+        
+        results = await asyncio.gather(
+            *(batcher.submit(AnalyzeRequest(message=f"msg {i}")) for i in range(5))
+        )
+        await batcher.stop()
+        
+        assert results == [f"msg {i}" for i in range(5)]
+        assert all(
+            len(call.args[0]) <= 2 for call in analyzer.analyze_combined.call_args_list
+        )
+    
+    async def test_errors_propagate_to_callers(self):
+        """Analyzer errors should be raised to every waiting caller"""
+        analyzer = Mock()
+        analyzer.analyze_combined.side_effect = RuntimeError("LLM down")
+        batcher = AnalysisBatcher(analyzer, max_wait_ms=1)
+        
+        with pytest.raises(RuntimeError, match="LLM down"):
+            await batcher.submit(AnalyzeRequest(message="msg"))
+        await batcher.stop()
+    
+    async def test_batches_run_on_dedicated_pool(self):
+        """Blocking batch calls should use the batcher's own threads"""
+        import threading
+        
+        thread_names = []
+        
+        def combined(requests):
+            thread_names.append(threading.current_thread().name)
+            return _fake_combined(requests)
+        
+        analyzer = Mock()
+        analyzer.analyze_combined.side_effect = combined
+        batcher = AnalysisBatcher(analyzer, max_wait_ms=1, max_concurrent_batches=1)
+        
+        assert await batcher.submit(AnalyzeRequest(message="msg")) == "msg"
+        await batcher.stop()
+        
+        assert thread_names[0].startswith("analysis-batch")
+    
+    async def test_stop_resolves_collecting_batch(self):
+        """Requests collected but not yet dispatched should still resolve on stop"""
+        analyzer = Mock()
+        analyzer.analyze_combined.side_effect = _fake_combined
+        batcher = AnalysisBatcher(analyzer, max_batch_size=8, max_wait_ms=10_000)
+        
+        tasks = [
+            asyncio.create_task(batcher.submit(AnalyzeRequest(message=f"msg {i}")))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.05)  # Worker is now waiting for the batch to fill
+        await batcher.stop()
+        
+        results = await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+        assert results == ["msg 0", "msg 1", "msg 2"]
+    
+    async def test_stop_resolves_queued_requests(self):
+        """Requests still queued when the worker is cancelled should resolve"""
+        analyzer = Mock()
+        analyzer.analyze_combined.side_effect = _fake_combined
+        batcher = AnalysisBatcher(analyzer, max_batch_size=2, max_wait_ms=10_000)
+        
+        tasks = [
+            asyncio.create_task(batcher.submit(AnalyzeRequest(message=f"msg {i}")))
+            for i in range(5)
+        ]
+        await asyncio.sleep(0)  # Queued, but the worker has not run yet
+        await batcher.stop()
+        
+        results = await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+        assert results == [f"msg {i}" for i in range(5)]
+        assert analyzer.analyze_combined.call_count == 3
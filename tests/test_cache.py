@@ -0,0 +1,132 @@
+"""
+Tests for the analysis result cache.
+
+Tests:
+- Key normalization and scoping
+- LRU eviction and TTL expiry
+- Fallback results are not cached
+- SQLite-backed LLM response cache
+"""
+from unittest.mock import patch
+
+from app.core.sqlite_cache import SQLiteCache
+from app.schemas.analysis import AnalyzeRequest
+from app.services.analyzer import AnalysisResult
+from app.services.cache import AnalysisCache
+
+
+def _result(llm_used=True):
+    """Build a minimal AnalysisResult"""
+    return AnalysisResult(
+        analysis={"sentiment": "positive"},
+        sanitization_applied=False,
+        threat_level="low",
+        llm_used=llm_used,
+        processing_time_ms=1.0,
+    )
+
+
+class TestCacheKey:
+    """Test cache key construction"""
+    
+    def test_whitespace_is_normalized(self):
+        """Messages differing only in whitespace should share a key"""
+        key_a = AnalysisCache.make_key(AnalyzeRequest(message="great  job"))
+        key_b = AnalysisCache.make_key(AnalyzeRequest(message=" great job\n"))
+        
+        assert key_a == key_b
+    
+    def test_metadata_is_part_of_key(self):
+        """Same message from different channels should not share a key"""
+        key_a = AnalysisCache.make_key(AnalyzeRequest(message="ok", channel_id="C1"))
+        key_b = AnalysisCache.make_key(AnalyzeRequest(message="ok", channel_id="C2"))
+        
+        assert key_a != key_b
+    
+    def test_sender_is_not_part_of_key(self):
+        """Sender is not rendered into the prompt, so it should not split keys"""
+        key_a = AnalysisCache.make_key(AnalyzeRequest(message="ok", user_id="U1"))
+        key_b = AnalysisCache.make_key(AnalyzeRequest(message="ok", user_id="U2"))
+        
+        assert key_a == key_b
+
+
+class TestAnalysisCache:
+    """Test storage, eviction and expiry"""
+    
+    def test_get_returns_stored_result(self):
+        """Should return what was stored"""
+        cache = AnalysisCache()
+        result = _result()
+        cache.set("k", result)
+        
+        assert cache.get("k") is result
+    
+    def test_fallback_not_cached(self):
+        """Results without an LLM call should not be stored"""
+        cache = AnalysisCache()
+        cache.set("k", _result(llm_used=False))
+        
+        assert cache.get("k") is None
+        assert len(cache) == 0
+    
+    def test_lru_eviction(self):
+        """Least recently used entry should be evicted first"""
+        cache = AnalysisCache(max_size=2)
+        cache.set("a", _result())
+        cache.set("b", _result())
+        cache.get("a")
+        cache.set("c", _result())
+        
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+    
+    def test_entries_expire(self):
+        """Entries older than the TTL should be dropped"""
+        cache = AnalysisCache(ttl_seconds=10)
+        
+        with patch('app.core.ttl_cache.time.monotonic', return_value=100.0):
+            cache.set("k", _result())
+        with patch('app.core.ttl_cache.time.monotonic', return_value=111.0):
+            assert cache.get("k") is None
+        
+        assert len(cache) == 0
+
+
+class TestSQLiteCache:
+    """Test persistent LLM response cache"""
+    
+    def test_roundtrip_across_connections(self, tmp_path):
+        """Entries should be visible to another connection on the same file"""
+        path = str(tmp_path / "llm_cache.db")
+        writer = SQLiteCache(path)
+        writer.set("k", {"sentiment": "positive", "stress_score": 2})
+        
+        reader = SQLiteCache(path)
+        
+        assert reader.get("k") == {"sentiment": "positive", "stress_score": 2}
+        assert reader.get("missing") is None
+        assert len(reader) == 1
+    
+    def test_entries_expire(self, tmp_path):
+        """Entries older than the TTL should not be returned"""
+        cache = SQLiteCache(str(tmp_path / "llm_cache.db"), ttl_seconds=10)
+        
+        with patch('app.core.sqlite_cache.time.time', return_value=100.0):
+            cache.set("k", {"a": 1})
+        with patch('app.core.sqlite_cache.time.time', return_value=111.0):
+            assert cache.get("k") is None
+    
+    def test_prune_trims_to_max_size(self, tmp_path):
+        """Pruning should keep only the newest max_size entries"""
+        cache = SQLiteCache(str(tmp_path / "llm_cache.db"), max_size=2)
+        for i, now in enumerate((1.0, 2.0, 3.0)):
+            with patch('app.core.sqlite_cache.time.time', return_value=now):
+                cache.set(f"k{i}", {"i": i})
+        
+        with patch('app.core.sqlite_cache.time.time', return_value=4.0):
+            cache._prune()
+            assert cache.get("k0") is None
+            assert cache.get("k2") == {"i": 2}
+        assert len(cache) == 2
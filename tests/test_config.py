@@ -187,3 +187,30 @@ class TestDefaultValues:
         """CORS origins should default to wildcard"""
         settings = Settings()
         assert settings.cors_origins == ["*"]
+
+    def test_settings_are_frozen(self):
+        """Shared settings should be immutable"""
+        settings = Settings()
+        with pytest.raises(ValidationError):
+            settings.debug = False
+
+    def test_cors_origin_set(self, monkeypatch):
+        """CORS origins should be exposed as a frozenset"""
+        monkeypatch.setenv("CORS_ORIGINS", '["http://a.example.com", "http://b.example.com"]')
+        settings = Settings()
+        assert settings.cors_origin_set == frozenset(
+            {"http://a.example.com", "http://b.example.com"}
+        )
+
+    def test_default_rate_limit_storage_development(self):
+        """Rate limit storage should default to in-memory outside production"""
+        settings = Settings()
+        assert settings.rate_limit_storage_uri == "memory://"
+
+    def test_default_rate_limit_storage_production(self, monkeypatch):
+        """Rate limit storage should default to Redis in production"""
+        monkeypatch.setenv("ENVIRONMENT", "production")
+        monkeypatch.setenv("GEMINI_API_KEY", "test_key")
+        monkeypatch.delenv("RATE_LIMIT_STORAGE", raising=False)
+        settings = Settings()
+        assert settings.rate_limit_storage_uri.startswith("redis://")
@@ -12,16 +12,32 @@ Tests:
 - Code fence stripping
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import json
 
+from app.core import llm_client
 from app.core.llm_client import (
     GeminiClient,
+    GeminiClientPool,
     LLMConfig,
     create_gemini_client,
+    create_gemini_client_pool,
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_shared_sdk_state():
+    """Each test patches the SDK, so don't reuse models or config across tests"""
+    llm_client._get_model.cache_clear()
+    llm_client._configured_api_key = None
+    # Models pin the SDK's default transports; never build real ones here
+    with patch('app.core.llm_client.genai_client.get_default_generative_client', side_effect=Mock), \
+            patch('app.core.llm_client.genai_client.get_default_generative_async_client', side_effect=Mock):
+        yield
+    llm_client._get_model.cache_clear()
+    llm_client._configured_api_key = None
+
+
 class TestLLMConfig:
     """Test LLM configuration dataclass"""
     
@@ -67,6 +83,20 @@ class TestGeminiClientInit:
         mock_model.assert_called_once()
         assert client.config == config
     
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_clients_share_model_and_sdk_config(self, mock_model, mock_configure):
+        """Identical configs should reuse one model and configure the SDK once"""
+        mock_model.side_effect = lambda **kwargs: Mock()
+        first = GeminiClient(LLMConfig(api_key="test_key"))
+        second = GeminiClient(LLMConfig(api_key="test_key"))
+        other_key = GeminiClient(LLMConfig(api_key="other_key"))
+        
+        assert first.model is second.model
+        assert other_key.model is not first.model
+        assert mock_model.call_count == 2
+        assert mock_configure.call_count == 2
+    
     @patch('app.core.llm_client.genai.configure')
     @patch('app.core.llm_client.genai.GenerativeModel')
     def test_model_configuration(self, mock_model, mock_configure):
@@ -152,6 +182,37 @@ class TestAPICall:
         assert "ASSISTANT:" in prompt
         assert "Assistant response" in prompt
 
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_prompt_prefix_reused_across_calls(self, mock_model_class, mock_configure):
+        """Static prefix should be formatted once and joined with the last turn"""
+        from app.core.llm_client import _format_prefix
+
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        _format_prefix.cache_clear()
+
+        system = {"role": "system", "content": "System prompt"}
+        first = client._build_prompt([system, {"role": "user", "content": "One"}])
+        second = client._build_prompt([system, {"role": "user", "content": "Two"}])
+
+        assert first == "SYSTEM INSTRUCTIONS:\nSystem prompt\n\nUSER:\nOne\n"
+        assert second.endswith("USER:\nTwo\n")
+        assert _format_prefix.cache_info().hits == 1
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_prompt_role_dispatch(self, mock_model_class, mock_configure):
+        """Missing role should default to user; unknown roles are dropped"""
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        
+        prompt = client._build_prompt([
+            {"role": "tool", "content": "ignored"},
+            {"role": "assistant", "content": "Earlier"},
+            {"content": "Now"},
+        ])
+        
+        assert prompt == "ASSISTANT:\nEarlier\n\nUSER:\nNow\n"
+
 
 class TestCodeFenceStripping:
     """Test code fence removal"""
@@ -191,6 +252,44 @@ class TestCodeFenceStripping:
         cleaned = client._strip_code_fences(text)
         
         assert cleaned == '{"key": "value"}'
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_strip_uppercase_fence_only_opening(self, mock_model, mock_configure):
+        """Should strip ```JSON fences and tolerate a missing closing fence"""
+        config = LLMConfig(api_key="test_key")
+        client = GeminiClient(config)
+        
+        assert client._strip_code_fences('```JSON\n{"key": "value"}\n```') == '{"key": "value"}'
+        assert client._strip_code_fences('```json\n{"key": "value"}') == '{"key": "value"}'
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_plain_json_skips_cleanup(self, mock_model, mock_configure):
+        """Only responses that fail a direct parse should hit the cleanup path"""
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        body = json.dumps(TestResponseCache.VALID)
+        
+        with patch.object(client, '_strip_code_fences', wraps=client._strip_code_fences) as strip:
+            client._process_response(body, 0.0, True)
+            strip.assert_not_called()
+            assert client.slow_path_parses == 0
+            
+            result = client._process_response(f"```json\n{body}\n```", 0.0, True)
+            strip.assert_called_once()
+        
+        assert client.slow_path_parses == 1
+        assert result["model_debug"]["fallback_used"] is False
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_schema_error_in_valid_json_is_not_repaired(self, mock_model, mock_configure):
+        """Well-formed JSON that fails the schema should raise without the repair path"""
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        
+        with pytest.raises(ValueError, match="Invalid response structure"):
+            client._process_response('{"sentiment": "ecstatic"}', 0.0, True)
+        assert client.slow_path_parses == 0
 
 
 class TestJSONRepair:
@@ -281,6 +380,15 @@ class TestSchemaValidation:
         
         with pytest.raises(ValueError, match="Invalid response structure"):
             client._validate_json_structure(invalid_data)
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_non_object_raises(self, mock_model, mock_configure):
+        """Should raise when the model returns a JSON array instead of an object"""
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        
+        with pytest.raises(ValueError, match="Invalid response structure"):
+            client._validate_json_structure([TestResponseCache.VALID])
 
 
 class TestFallbackResponse:
@@ -305,6 +413,23 @@ class TestFallbackResponse:
         # Should pass Pydantic validation
         validated = client._validate_json_structure(fallback)
         assert validated is not None
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_fallbacks_do_not_share_containers(self, mock_model, mock_configure):
+        """Mutating one fallback must not leak into the next"""
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        
+        first = client._generate_fallback_response(error_type="A")
+        first["model_debug"]["sanitization_applied"] = True
+        first["action_items"].append("extra")
+        first["confidence_scores"]["stress"] = 0.9
+        
+        second = client._generate_fallback_response(error_type="B")
+        
+        assert second["model_debug"] == {"model": "fallback", "fallback_used": True, "error_type": "B"}
+        assert second["action_items"] == ["Review message", "Follow up with sender"]
+        assert second["confidence_scores"]["stress"] == 0.5
 
 
 class TestAnalyzeMethod:
@@ -384,6 +509,354 @@ class TestAnalyzeMethod:
         with pytest.raises(RuntimeError, match="LLM analysis failed"):
             client.analyze(messages, fallback_on_error=False)
 
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_async_analysis(self, mock_model_class, mock_configure):
+        """Should await the SDK's async call instead of the blocking one"""
+        valid_response = {
+            "sentiment": "neutral",
+            "emotion": "neutral",
+            "stress_score": 3,
+            "category": "general",
+            "confidence_scores": {
+                "sentiment": 0.8,
+                "emotion": 0.8,
+                "category": 0.8,
+                "stress": 0.8
+            },
+            "urgency": False
+        }
+        
+        mock_response = Mock()
+        mock_response.text = json.dumps(valid_response)
+        mock_response.candidates = []
+        
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(return_value=mock_response)
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        result = await client.aanalyze([{"role": "user", "content": "Test"}])
+        
+        assert result["sentiment"] == "neutral"
+        assert result["model_debug"]["fallback_used"] is False
+        mock_model.generate_content_async.assert_awaited_once()
+        mock_model.generate_content.assert_not_called()
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_async_analysis_without_fallback_raises(self, mock_model_class, mock_configure):
+        """Should raise error when async call fails and fallback disabled"""
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(side_effect=Exception("API Error"))
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        
+        with pytest.raises(RuntimeError, match="LLM analysis failed"):
+            await client.aanalyze([{"role": "user", "content": "Test"}], fallback_on_error=False)
+
+class TestAnalyzeMany:
+    """Test batched analysis in a single API call"""
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_returns_one_result_per_message(self, mock_model_class, mock_configure):
+        """Should validate each array item and fall back per invalid item"""
+        valid_response = {
+            "sentiment": "positive",
+            "emotion": "joy",
+            "stress_score": 2,
+            "category": "praise",
+            "confidence_scores": {
+                "sentiment": 0.9,
+                "emotion": 0.85,
+                "category": 0.8,
+                "stress": 0.75
+            },
+            "urgency": False
+        }
+        
+        mock_response = Mock()
+        mock_response.text = json.dumps([valid_response, {"sentiment": "bogus"}])
+        mock_response.candidates = []  # Empty to use .text path
+        
+        mock_model = Mock()
+        mock_model.generate_content.return_value = mock_response
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        results = client.analyze_many([{"role": "user", "content": "Test"}], 2)
+        
+        assert len(results) == 2
+        assert results[0]["sentiment"] == "positive"
+        assert results[0]["model_debug"]["fallback_used"] is False
+        assert results[1]["model_debug"]["fallback_used"] is True
+        mock_model.generate_content.assert_called_once()
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_count_mismatch_uses_fallback(self, mock_model_class, mock_configure):
+        """Should fall back for every message when array length is wrong"""
+        mock_response = Mock()
+        mock_response.text = "[]"
+        mock_response.candidates = []
+        
+        mock_model = Mock()
+        mock_model.generate_content.return_value = mock_response
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        results = client.analyze_many([{"role": "user", "content": "Test"}], 3)
+        
+        assert len(results) == 3
+        assert all(r["model_debug"]["fallback_used"] for r in results)
+
+
+class TestConcurrentAnalysis:
+    """Test overlapping async calls with a concurrency cap"""
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_respects_max_concurrency(self, mock_model_class, mock_configure):
+        """Should never exceed max_concurrency in-flight calls"""
+        import asyncio
+        
+        in_flight = 0
+        peak = 0
+        
+        async def slow_call(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = Mock()
+            response.text = "not json"
+            response.candidates = []
+            return response
+        
+        mock_model = Mock()
+        mock_model.generate_content_async = slow_call
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        batch = [[{"role": "user", "content": f"msg {i}"}] for i in range(6)]
+        results = await client.aanalyze_concurrent(batch, max_concurrency=2)
+        
+        assert len(results) == 6
+        assert peak == 2
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_rpm_cap_waits_for_window(self, mock_model_class, mock_configure):
+        """Should sleep when the per-minute request window is full"""
+        client = GeminiClient(LLMConfig(api_key="test_key", max_requests_per_minute=1))
+        
+        with patch('app.core.llm_client.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            await client._throttle()
+            mock_sleep.assert_not_awaited()
+            
+            # Simulate the window expiring while we wait
+            mock_sleep.side_effect = lambda _: client._request_times.clear()
+            await client._throttle()
+            mock_sleep.assert_awaited_once()
+
+
+class TestResponseCache:
+    """Test exact-match prompt cache"""
+    
+    VALID = {
+        "sentiment": "positive",
+        "emotion": "joy",
+        "stress_score": 2,
+        "category": "praise",
+        "confidence_scores": {
+            "sentiment": 0.9,
+            "emotion": 0.85,
+            "category": 0.8,
+            "stress": 0.75
+        },
+        "urgency": False
+    }
+    
+    def _client(self, mock_model_class, text, **config):
+        mock_response = Mock()
+        mock_response.text = text
+        mock_response.candidates = []
+        mock_model = Mock()
+        mock_model.generate_content.return_value = mock_response
+        mock_model_class.return_value = mock_model
+        return GeminiClient(LLMConfig(api_key="test_key", **config)), mock_model
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_identical_prompt_hits_cache(self, mock_model_class, mock_configure):
+        """Second identical prompt should not call the API"""
+        client, mock_model = self._client(mock_model_class, json.dumps(self.VALID))
+        messages = [{"role": "user", "content": "Great work!"}]
+        
+        first = client.analyze(messages)
+        first["model_debug"]["threat_level"] = "low"  # caller mutation
+        second = client.analyze(messages)
+        
+        assert mock_model.generate_content.call_count == 1
+        assert second["sentiment"] == "positive"
+        assert second["model_debug"]["cache"] == "exact_hit"
+        assert "threat_level" not in second["model_debug"]
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_cache_key_ignores_dict_key_order(self, mock_model_class, mock_configure):
+        """Prompts differing only in message key order should share a cache entry"""
+        client, mock_model = self._client(mock_model_class, json.dumps(self.VALID))
+        
+        client.analyze([{"role": "user", "content": "Great work!"}])
+        client.analyze([{"content": "Great work!", "role": "user"}])
+        
+        assert mock_model.generate_content.call_count == 1
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_fallback_not_cached(self, mock_model_class, mock_configure):
+        """Fallback responses should be retried, not cached"""
+        client, mock_model = self._client(mock_model_class, "not json at all")
+        messages = [{"role": "user", "content": "Test"}]
+        
+        client.analyze(messages)
+        client.analyze(messages)
+        
+        assert mock_model.generate_content.call_count == 2
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_sqlite_cache_shared_between_clients(
+        self, mock_model_class, mock_configure, tmp_path
+    ):
+        """A response cached by one client should be a hit for another on the same file"""
+        path = str(tmp_path / "llm_cache.db")
+        first, _ = self._client(
+            mock_model_class, json.dumps(self.VALID), response_cache_path=path
+        )
+        messages = [{"role": "user", "content": "Great work!"}]
+        first.analyze(messages)
+        
+        second, _ = self._client(mock_model_class, "unused", response_cache_path=path)
+        second.model.generate_content_async = AsyncMock()
+        result = await second.aanalyze(messages)
+        
+        second.model.generate_content_async.assert_not_called()
+        assert result["model_debug"]["cache"] == "exact_hit"
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_cache_disabled(self, mock_model_class, mock_configure):
+        """response_cache_size=0 should disable caching"""
+        client, mock_model = self._client(
+            mock_model_class, json.dumps(self.VALID), response_cache_size=0
+        )
+        messages = [{"role": "user", "content": "Great work!"}]
+        
+        client.analyze(messages)
+        client.analyze(messages)
+        
+        assert mock_model.generate_content.call_count == 2
+
+
+class TestSemanticCache:
+    """Test optional near-duplicate cache integration"""
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_missing_dependencies_disable_cache(self, mock_model_class, mock_configure):
+        """Client should start without the semantic cache if deps are missing"""
+        with patch('app.core.llm_client.SemanticCache', side_effect=ImportError("no faiss")):
+            client = GeminiClient(LLMConfig(api_key="test_key", semantic_cache_threshold=0.9))
+        
+        assert client._semantic_cache is None
+    
+    def test_semantic_cache_must_quantize_before_full(self):
+        """Quantizing only once the cache is full would never add capacity"""
+        from app.core.semantic_cache import SemanticCache
+        
+        with pytest.raises(ValueError, match="quantize_after"):
+            SemanticCache(max_size=10_000, quantize_after=10_000)
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_semantic_hit_skips_api(self, mock_model_class, mock_configure):
+        """A similar prior prompt should be answered without an API call"""
+        mock_model = Mock()
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        client._semantic_cache = Mock()
+        client._semantic_cache.lookup.return_value = (0.95, dict(TestResponseCache.VALID))
+        
+        result = client.analyze([{"role": "user", "content": "password reset steps"}])
+        
+        mock_model.generate_content.assert_not_called()
+        client._semantic_cache.lookup.assert_called_once_with("password reset steps")
+        assert result["model_debug"]["cache"] == "semantic"
+        assert result["model_debug"]["similarity"] == 0.95
+
+
+class TestInflightDeduplication:
+    """Test coalescing of concurrent identical prompts"""
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_concurrent_identical_prompts_share_call(self, mock_model_class, mock_configure):
+        """Followers should await the leader's call instead of issuing their own"""
+        import asyncio
+        
+        async def slow_call(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            response = Mock()
+            response.text = json.dumps(TestResponseCache.VALID)
+            response.candidates = []
+            return response
+        
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(side_effect=slow_call)
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key", response_cache_size=0))
+        messages = [{"role": "user", "content": "thanks!"}]
+        
+        results = await asyncio.gather(*(client.aanalyze(messages) for _ in range(5)))
+        
+        assert mock_model.generate_content_async.await_count == 1
+        assert all(r["sentiment"] == "positive" for r in results)
+        assert len({id(r) for r in results}) == 5  # each caller gets its own dict
+        assert client._inflight == {}
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_followers_receive_leader_error(self, mock_model_class, mock_configure):
+        """Errors should propagate to every waiter when fallback is disabled"""
+        import asyncio
+        
+        async def failing_call(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            raise Exception("API Error")
+        
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(side_effect=failing_call)
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        messages = [{"role": "user", "content": "Test"}]
+        
+        results = await asyncio.gather(
+            *(client.aanalyze(messages, fallback_on_error=False) for _ in range(3)),
+            return_exceptions=True,
+        )
+        
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert mock_model.generate_content_async.await_count == 1
+
 
 class TestTextExtraction:
     """Test robust text extraction from various response shapes"""
@@ -436,6 +909,23 @@ class TestTextExtraction:
         text = client._extract_text_from_response(response)
         assert text == '{"key": "value"}'
     
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_text_property_error_falls_back(self, mock_model, mock_configure):
+        """SDK .text raising ValueError (no parts) should fall through to candidates"""
+        from unittest.mock import PropertyMock
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        
+        candidate = Mock()
+        candidate.output = None
+        candidate.text = '{"key": "value"}'
+        response = Mock()
+        type(response).text = PropertyMock(side_effect=ValueError("no parts"))
+        response.candidates = [candidate]
+        
+        assert client._extract_text_from_response(response) == '{"key": "value"}'
+    
     @patch('app.core.llm_client.genai.configure')
     @patch('app.core.llm_client.genai.GenerativeModel')
     def test_extract_raises_on_empty(self, mock_model, mock_configure):
@@ -467,6 +957,18 @@ class TestJSONRepairSafety:
         assert repaired is not None
         assert repaired["message"] == "Hello, world"
     
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_repair_ignores_commas_and_braces_in_strings(self, mock_model, mock_configure):
+        """Trailing-comma removal and brace balancing should skip string contents"""
+        config = LLMConfig(api_key="test_key")
+        client = GeminiClient(config)
+        
+        text = '{"message": "done, }", "tags": ["a",], "outer": {"inner": "{"}'
+        repaired = client._attempt_json_repair(text)
+        
+        assert repaired == {"message": "done, }", "tags": ["a"], "outer": {"inner": "{"}}
+    
     @patch('app.core.llm_client.genai.configure')
     @patch('app.core.llm_client.genai.GenerativeModel')
     def test_repair_strips_code_fences_first(self, mock_model, mock_configure):
@@ -523,7 +1025,7 @@ class TestJSONRepairSafety:
 
 
 class TestRetryPolicy:
-    """Test that retry policy only retries network errors"""
+    """Test that retry policy only retries transient errors"""
     
     @patch('app.core.llm_client.genai.configure')
     @patch('app.core.llm_client.genai.GenerativeModel')
@@ -571,6 +1073,48 @@ class TestRetryPolicy:
         # Should only call once (no retry)
         assert mock_model.generate_content.call_count == 1
 
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_async_retries_follow_config(self, mock_model_class, mock_configure):
+        """Async path should retry gRPC deadline errors up to max_retries"""
+        from google.api_core.exceptions import DeadlineExceeded
+        
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(side_effect=DeadlineExceeded("slow"))
+        mock_model_class.return_value = mock_model
+        
+        config = LLMConfig(api_key="test_key", max_retries=2, retry_min_wait=0, retry_max_wait=0)
+        client = GeminiClient(config)
+        
+        with pytest.raises(DeadlineExceeded):
+            await client._amake_api_call([{"role": "user", "content": "Test"}])
+        
+        assert mock_model.generate_content_async.await_count == 2
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_async_retries_rate_limit(self, mock_model_class, mock_configure):
+        """429/5xx from the API should be retried, not sent straight to fallback"""
+        from google.api_core.exceptions import InternalServerError, ResourceExhausted
+        
+        mock_response = Mock()
+        mock_response.text = '{"key": "value"}'
+        mock_response.candidates = []
+        
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(
+            side_effect=[ResourceExhausted("quota"), InternalServerError("oops"), mock_response]
+        )
+        mock_model_class.return_value = mock_model
+        
+        config = LLMConfig(api_key="test_key", max_retries=3, retry_min_wait=0, retry_max_wait=0)
+        client = GeminiClient(config)
+        
+        response = await client._amake_api_call([{"role": "user", "content": "Test"}])
+        
+        assert response == '{"key": "value"}'
+        assert mock_model.generate_content_async.await_count == 3
 
 class TestModelDebugMetadata:
     """Test that model_debug includes safe metadata"""
@@ -632,6 +1176,216 @@ class TestModelDebugMetadata:
         assert result["model_debug"]["error_type"] == "Exception"
 
 
+class TestWarmup:
+    """Test connection warmup"""
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_warmup_uses_async_transport(self, mock_model_class, mock_configure):
+        """Should issue a cheap async request"""
+        mock_model = Mock()
+        mock_model.count_tokens_async = AsyncMock()
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        
+        assert await client.warmup(timeout=2.0) is True
+        mock_model.count_tokens_async.assert_awaited_once()
+        mock_model.generate_content_async.assert_not_called()
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_warmup_failure_is_not_fatal(self, mock_model_class, mock_configure):
+        """Should swallow warmup errors"""
+        mock_model = Mock()
+        mock_model.count_tokens_async = AsyncMock(side_effect=Exception("unreachable"))
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        
+        assert await client.warmup() is False
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_aclose_resets_shared_sdk_state(self, mock_model_class, mock_configure):
+        """Should leave shared transports open and make later clients start fresh"""
+        first_model, second_model = Mock(), Mock()
+        mock_model_class.side_effect = [first_model, second_model]
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        async_client = first_model._async_client
+        await client.aclose()
+        later = GeminiClient(LLMConfig(api_key="test_key"))
+        
+        async_client.transport.close.assert_not_called()
+        assert first_model._async_client is async_client
+        assert mock_configure.call_count == 2
+        assert later.model is second_model
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_clients_pin_their_own_key_transports(self, mock_model_class, mock_configure):
+        """A client built before another key is configured should keep its own key"""
+        mock_model_class.side_effect = [Mock(), Mock()]
+        
+        with patch('app.core.llm_client.genai_client.get_default_generative_client') as get_client:
+            get_client.side_effect = ["transport_a", "transport_b"]
+            client_a = GeminiClient(LLMConfig(api_key="key_a"))
+            client_b = GeminiClient(LLMConfig(api_key="key_b"))
+        
+        assert [c.kwargs["api_key"] for c in mock_configure.call_args_list] == ["key_a", "key_b"]
+        assert client_a.model._client == "transport_a"
+        assert client_b.model._client == "transport_b"
+
+
+@patch('app.core.llm_client.genai_client.get_default_generative_async_client')
+@patch('app.core.llm_client.genai_client.get_default_generative_client')
+@patch('app.core.llm_client.genai.configure')
+@patch('app.core.llm_client.genai.GenerativeModel')
+class TestClientPool:
+    """Test multi-key client pool"""
+    
+    def _pool(self, mock_model_class, *calls):
+        models = []
+        for call in calls:
+            model = Mock()
+            model.generate_content_async = call
+            models.append(model)
+        mock_model_class.side_effect = models
+        keys = [f"key_{i}" for i in range(len(calls))]
+        return create_gemini_client_pool(api_keys=keys, max_retries=1), models
+    
+    @staticmethod
+    def _ok():
+        response = Mock()
+        response.text = json.dumps(TestResponseCache.VALID)
+        response.candidates = []
+        return AsyncMock(return_value=response)
+    
+    async def test_one_client_per_key_with_shared_cache(self, mock_model_class, mock_configure, *_):
+        """Should configure each key and share one response cache"""
+        pool, _ = self._pool(mock_model_class, self._ok(), self._ok())
+        
+        assert isinstance(pool, GeminiClientPool)
+        assert [c.config.api_key for c in pool.clients] == ["key_0", "key_1"]
+        assert pool.clients[0]._response_cache is pool.clients[1]._response_cache
+    
+    async def test_dispatches_to_least_loaded(self, mock_model_class, *_):
+        """Concurrent calls should be spread across keys"""
+        import asyncio
+        
+        oks = [self._ok(), self._ok()]
+        
+        def slow(ok):
+            async def call(*args, **kwargs):
+                await asyncio.sleep(0.01)
+                return await ok(*args, **kwargs)
+            return call
+        
+        pool, _ = self._pool(mock_model_class, slow(oks[0]), slow(oks[1]))
+        batch = [[{"role": "user", "content": f"msg {i}"}] for i in range(4)]
+        results = await pool.aanalyze_concurrent(batch)
+        
+        assert all(not r["model_debug"]["fallback_used"] for r in results)
+        assert [ok.await_count for ok in oks] == [2, 2]
+        assert pool._inflight == [0, 0]
+    
+    async def test_fails_over_on_quota_exhausted(self, mock_model_class, *_):
+        """A 429 on one key should be retried on a sibling key"""
+        from google.api_core.exceptions import ResourceExhausted
+        
+        exhausted = AsyncMock(side_effect=ResourceExhausted("quota"))
+        ok = self._ok()
+        pool, _ = self._pool(mock_model_class, exhausted, ok)
+        
+        result = await pool.aanalyze([{"role": "user", "content": "Great work!"}])
+        
+        assert result["model_debug"]["fallback_used"] is False
+        exhausted.assert_awaited_once()
+        ok.assert_awaited_once()
+    
+    async def test_all_keys_exhausted_uses_fallback(self, mock_model_class, *_):
+        """Should fall back once every key has failed"""
+        from google.api_core.exceptions import ResourceExhausted
+        
+        exhausted = AsyncMock(side_effect=ResourceExhausted("quota"))
+        pool, _ = self._pool(mock_model_class, exhausted, exhausted)
+        
+        result = await pool.aanalyze([{"role": "user", "content": "Great work!"}])
+        
+        assert result["model_debug"]["fallback_used"] is True
+        assert result["model_debug"]["error_type"] == "ResourceExhausted"
+        assert exhausted.await_count == 2
+    
+    def test_requires_keys(self, *_):
+        """Should reject an empty key list"""
+        with pytest.raises(ValueError):
+            GeminiClientPool([])
+
+
+class TestStreamingAnalysis:
+    """Test incremental field extraction from streamed responses"""
+    
+    def test_parser_waits_for_complete_values(self):
+        """Fields should only be reported once their value is complete"""
+        from app.core.llm_client import _StreamingFieldParser
+        
+        parser = _StreamingFieldParser()
+        
+        assert parser.feed('```json\n{"sentiment": "posi') == {}
+        assert parser.feed('tive", "stress_score": 1') == {"sentiment": "positive"}
+        assert parser.feed('0, "confidence_scores": {"a": 1}') == {"stress_score": 10}
+        assert parser.feed('}\n```') == {"confidence_scores": {"a": 1}}
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_stream_yields_fields_then_result(self, mock_model_class, mock_configure):
+        """Should yield partial fields, then the validated result"""
+        body = json.dumps(TestResponseCache.VALID)
+        split = body.index('"emotion"')
+        
+        class Chunk:
+            def __init__(self, text):
+                self.text = text
+        
+        async def stream():
+            for part in (body[:split], body[split:]):
+                yield Chunk(part)
+        
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(return_value=stream())
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        events = [
+            event async for event in client.aanalyze_stream([{"role": "user", "content": "Hi"}])
+        ]
+        
+        assert events[0] == (False, {"sentiment": "positive"})
+        final, result = events[-1]
+        assert final is True
+        assert result["stress_score"] == 2
+        assert result["model_debug"]["fallback_used"] is False
+        assert mock_model.generate_content_async.call_args.kwargs["stream"] is True
+    
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    async def test_stream_error_ends_with_fallback(self, mock_model_class, mock_configure):
+        """API errors should end the stream with a fallback result"""
+        mock_model = Mock()
+        mock_model.generate_content_async = AsyncMock(side_effect=ValueError("boom"))
+        mock_model_class.return_value = mock_model
+        
+        client = GeminiClient(LLMConfig(api_key="test_key"))
+        events = [
+            event async for event in client.aanalyze_stream([{"role": "user", "content": "Hi"}])
+        ]
+        
+        assert len(events) == 1
+        assert events[0][0] is True
+        assert events[0][1]["model_debug"]["fallback_used"] is True
+
+
 class TestFactoryFunction:
     """Test create_gemini_client factory"""
     
@@ -653,6 +1407,19 @@ class TestFactoryFunction:
         
         assert client.config.api_key == "env_key"
     
+    @patch.dict('os.environ', {'LLM_SEMANTIC_CACHE_THRESHOLD': '0.95'})
+    @patch('app.core.llm_client.SemanticCache')
+    @patch('app.core.llm_client.genai.configure')
+    @patch('app.core.llm_client.genai.GenerativeModel')
+    def test_factory_semantic_cache_from_env(self, mock_model, mock_configure, mock_cache):
+        """LLM_SEMANTIC_CACHE_THRESHOLD should enable the semantic cache"""
+        client = create_gemini_client(api_key="test_key")
+        
+        assert client.config.semantic_cache_threshold == 0.95
+        assert mock_cache.call_args.kwargs["threshold"] == 0.95
+        kwargs = mock_cache.call_args.kwargs
+        assert kwargs["quantize_after"] < kwargs["max_size"]
+    
     @patch.dict('os.environ', {}, clear=True)
     def test_factory_without_key_raises(self):
         """Should raise if no API key provided"""
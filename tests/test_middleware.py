@@ -0,0 +1,71 @@
+"""
+Tests for ASGI request guards.
+
+Tests:
+- Oversize Content-Length rejected before the body is read
+- Oversize streamed bodies rejected while reading
+- Requests within the limit pass through
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.middleware import ContentLengthLimitMiddleware
+from app.main import app
+
+
+@pytest.fixture
+def small_client():
+    """App with a 10-byte body limit"""
+    small_app = FastAPI()
+    small_app.add_middleware(ContentLengthLimitMiddleware, max_bytes=10)
+
+    @small_app.post("/echo")
+    async def echo(payload: dict):
+        return payload
+
+    return TestClient(small_app)
+
+
+class TestContentLengthLimit:
+    """Test body size enforcement"""
+    
+    def test_declared_oversize_rejected(self, small_client):
+        """Should return 413 based on Content-Length alone"""
+        response = small_client.post("/echo", json={"message": "x" * 50})
+        
+        assert response.status_code == 413
+        data = response.json()
+        assert data["success"] is False
+        assert data["error"] == "payload_too_large"
+        assert data["details"]["max_bytes"] == 10
+    
+    def test_streamed_oversize_rejected(self, small_client):
+        """Should return 413 for chunked bodies crossing the limit"""
+        def chunks():
+            yield b'{"message": '
+            yield b'"' + b"x" * 50 + b'"}'
+        
+        response = small_client.post(
+            "/echo", content=chunks(), headers={"content-type": "application/json"}
+        )
+        
+        assert response.status_code == 413
+    
+    def test_small_body_passes(self, small_client):
+        """Should pass bodies within the limit"""
+        response = small_client.post("/echo", json={"a": 1})
+        
+        assert response.status_code == 200
+        assert response.json() == {"a": 1}
+    
+    def test_main_app_enforces_max_request_size(self):
+        """Main app should reject bodies above MAX_REQUEST_SIZE"""
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/analyze",
+            content=b"x" * 2_000_000,
+            headers={"content-type": "application/json"},
+        )
+        
+        assert response.status_code == 413
@@ -10,6 +10,8 @@ Covers:
 - JSON extraction/validation
 """
 import json
+from unittest.mock import MagicMock, patch
+
 import pytest
 from app.core.prompt_templates import (
     SYSTEM_PROMPT,
@@ -20,6 +22,8 @@ from app.core.prompt_templates import (
     build_prompt,
     get_system_prompt,
     get_few_shot_examples,
+    _prompt_statics,
+    _similar_example_order,
 )
 from app.schemas.analysis import (
     AnalyzeResponse,
@@ -250,6 +254,19 @@ class TestPromptBuilder:
         assistant_msgs = [m for m in messages if m["role"] == "assistant"]
         assert len(assistant_msgs) == 1
     
+    def test_build_batch_prompt(self):
+        """Batch prompt should share the prefix and list every message"""
+        contexts = [PromptContext(message="First message"), PromptContext(message="Second message")]
+        single = PromptBuilder.build_analysis_prompt(contexts[0])
+        batch = PromptBuilder.build_batch_analysis_prompt(contexts)
+        
+        assert batch[:-1] == single[:-1]
+        assert batch[-1]["role"] == "user"
+        assert "### MESSAGE 1" in batch[-1]["content"]
+        assert "### MESSAGE 2" in batch[-1]["content"]
+        assert "Second message" in batch[-1]["content"]
+        assert "JSON array of exactly 2 objects" in batch[-1]["content"]
+    
     def test_includes_metadata_context(self):
         """Should include metadata in user message"""
         ctx = PromptContext(
@@ -290,6 +307,16 @@ class TestTokenEstimation:
         assert tokens > 0
         assert tokens < len(text)  # Should be less than character count
     
+    def test_budget_constants_measured_from_prompt(self):
+        """Static part token budgets should be measured, not guessed"""
+        statics = _prompt_statics()
+        assert statics.system_tokens == PromptBuilder.estimate_tokens(SYSTEM_PROMPT)
+        assert statics.schema_tokens == (
+            PromptBuilder.estimate_tokens(get_system_prompt(include_schema=True))
+            - statics.system_tokens
+        )
+        assert all(tokens > 0 for tokens in statics.turn_tokens)
+    
     def test_token_budget_respected(self):
         """Should not exceed max_context_tokens"""
         ctx = PromptContext(message="Test")
@@ -364,6 +391,15 @@ class TestJSONValidation:
         assert extracted is not None
         assert extracted == '{"sentiment": "positive"}'
     
+    def test_extract_prefers_first_fenced_block(self):
+        """Fenced JSON should win over braces in surrounding prose"""
+        response = (
+            'Using {placeholders} here:\n```\n{"sentiment": "positive"}\n```\n'
+            '```json\n{"sentiment": "negative"}\n```'
+        )
+        extracted = PromptBuilder.extract_json_from_response(response)
+        assert extracted == '{"sentiment": "positive"}'
+    
     def test_extract_returns_none_for_no_json(self):
         """Should return None when no JSON found"""
         response = 'This is just plain text without JSON'
@@ -395,6 +431,44 @@ class TestConvenienceFunctions:
         assert "JSON SCHEMA" in prompt or "schema" in prompt.lower()
         assert len(prompt) > len(SYSTEM_PROMPT)
     
+    def test_system_prefix_is_identical_across_builds(self):
+        """Schema prefix should be byte-identical between prompts"""
+        first = build_prompt("First message")
+        second = build_prompt("Second message")
+        assert first[0]["content"] == second[0]["content"]
+        assert first[0]["content"] == get_system_prompt(include_schema=True)
+
+    def test_anthropic_provider_marks_end_of_prefix(self):
+        """Anthropic prompts should mark only the last prefix turn as cacheable"""
+        context = PromptContext(message="Test", metadata={"channel": "general"})
+        messages = PromptBuilder.build_analysis_prompt(
+            context, max_examples=2, provider="anthropic"
+        )
+
+        marked = [
+            i for i, m in enumerate(messages[:-1]) if "cache_control" in m["content"][0]
+        ]
+        assert marked == [len(messages) - 2]
+        assert messages[-2]["role"] == "assistant"
+        assert messages[0]["content"][0]["text"] == get_system_prompt(include_schema=True)
+        # Dynamic content stays a plain, uncached string in the final turn
+        assert isinstance(messages[-1]["content"], str)
+        assert "Channel: general" in messages[-1]["content"]
+
+    def test_batch_prompts_match_single_builds(self):
+        """Batched prompts should equal per-context builds and not share dicts"""
+        contexts = [
+            PromptContext(message="First message"),
+            PromptContext(message="Second message", metadata={"channel": "dev"}),
+        ]
+        prompts = PromptBuilder.build_analysis_prompts_batch(contexts, max_examples=2)
+
+        assert prompts == [
+            PromptBuilder.build_analysis_prompt(c, max_examples=2) for c in contexts
+        ]
+        prompts[0][0]["content"] = "changed"
+        assert prompts[1][0]["content"] == get_system_prompt(include_schema=True)
+
     def test_get_system_prompt_without_schema(self):
         """get_system_prompt should exclude schema when requested"""
         prompt = get_system_prompt(include_schema=False)
@@ -475,6 +549,66 @@ class TestExampleSelection:
         assert len(selected_large) > len(selected_small)
 
 
+    def test_selected_examples_fit_token_budget(self):
+        """Selected examples' measured tokens should not exceed the budget"""
+        budget = 700
+        selected = PromptBuilder._select_examples(max_count=10, token_budget=budget)
+        used = sum(
+            PromptBuilder.estimate_tokens(PromptBuilder._format_user_message(ex["user_message"]))
+            + PromptBuilder.estimate_tokens(
+                json.dumps(ex["assistant_response"], sort_keys=True, separators=(",", ":"))
+            )
+            for ex in selected
+        )
+        assert selected
+        assert used <= budget
+    
+    def test_example_turns_match_selected_examples(self):
+        """Few-shot turns should carry the selected examples' content"""
+        messages = build_prompt("Test", max_examples=3)
+        selected = PromptBuilder._select_examples(max_count=3, token_budget=5000)
+        assistant_turns = [m["content"] for m in messages if m["role"] == "assistant"]
+
+        assert [json.loads(c) for c in assistant_turns] == [
+            ex["assistant_response"] for ex in selected
+        ]
+        assert assistant_turns == [m["content"] for m in build_prompt("Other") if m["role"] == "assistant"]
+
+    def test_similar_examples_follow_similarity_order(self):
+        """similar_examples should put the most similar examples first"""
+        order = (4, 0, 1, 2, 3, 5, 6, 7)
+        with patch("app.core.prompt_templates._similar_example_order", return_value=order):
+            messages = PromptBuilder.build_analysis_prompt(
+                PromptContext(message="How do deployments work now?"),
+                max_examples=2,
+                similar_examples=True,
+            )
+        assistant_turns = [json.loads(m["content"]) for m in messages if m["role"] == "assistant"]
+        assert assistant_turns == [
+            FEW_SHOT_EXAMPLES[4]["assistant_response"],
+            FEW_SHOT_EXAMPLES[0]["assistant_response"],
+        ]
+
+    def test_similar_examples_fall_back_to_priority_order(self):
+        """Without an embedding model, selection should match the default"""
+        ctx = PromptContext(message="Test")
+        with patch("app.core.prompt_templates._similar_example_order", return_value=None):
+            similar = PromptBuilder.build_analysis_prompt(ctx, similar_examples=True)
+        assert similar == PromptBuilder.build_analysis_prompt(ctx)
+
+    def test_similar_example_order_cached_by_digest(self):
+        """Repeated messages should reuse the order without keeping the raw text"""
+        model, embeddings = MagicMock(), MagicMock()
+        (-(embeddings @ None)).argsort.return_value = [2, 0, 1]
+        message = "jane.doe@example.com keeps missing standups"
+        with patch(
+            "app.core.prompt_templates._get_example_embedder", return_value=(model, embeddings)
+        ), patch.dict("app.core.prompt_templates._example_orders", clear=True) as orders:
+            assert _similar_example_order(message) == (2, 0, 1)
+            assert _similar_example_order(message) == (2, 0, 1)
+            assert model.encode.call_count == 1
+            assert all(isinstance(key, bytes) and message.encode() not in key for key in orders)
+
 class TestEdgeCases:
     """Test edge cases and error handling."""
     
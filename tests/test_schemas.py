@@ -208,6 +208,32 @@ class TestAnalyzeResponse:
                 ),
                 urgency=False
             )
+
+    def test_unhashable_emotion_fails_validation(self):
+        """Test that a malformed emotion is a ValidationError, not a TypeError"""
+        with pytest.raises(ValidationError):
+            AnalyzeResponse(
+                sentiment=SentimentEnum.NEUTRAL,
+                emotion=["anger"],
+                stress_score=5,
+                category=CategoryEnum.GENERAL,
+                confidence_scores=ConfidenceScores(
+                    sentiment=0.9, emotion=0.9, category=0.9, stress=0.9
+                ),
+            )
+
+    def test_critical_emotion_sets_urgency(self):
+        """Test that anger or fear flags the message as urgent"""
+        response = AnalyzeResponse(
+            sentiment=SentimentEnum.NEGATIVE,
+            emotion="fear",
+            stress_score=2,
+            category=CategoryEnum.GENERAL,
+            confidence_scores=ConfidenceScores(
+                sentiment=0.9, emotion=0.9, category=0.9, stress=0.9
+            ),
+        )
+        assert response.urgency is True
     
     def test_key_phrases_empty_strings_filtered(self):
         """Test that empty strings in key_phrases are filtered"""
@@ -288,7 +314,15 @@ class TestAnalysisJsonSchema:
         assert "stress_score" in required
         assert "category" in required
         assert "confidence_scores" in required
-        assert "urgency" in required
+        # urgency has a default (the validator derives it), so it is optional
+        assert ANALYSIS_JSON_SCHEMA["properties"]["urgency"]["type"] == "boolean"
+
+    def test_schema_matches_model(self):
+        """Test that the exported schema is derived from AnalyzeResponse"""
+        assert set(ANALYSIS_JSON_SCHEMA["properties"]) == set(AnalyzeResponse.model_fields)
+        assert "$defs" not in ANALYSIS_JSON_SCHEMA
+        confidence = ANALYSIS_JSON_SCHEMA["properties"]["confidence_scores"]
+        assert confidence["additionalProperties"] is False
     
     def test_schema_enum_values(self):
         """Test that schema includes correct enum values"""
@@ -350,6 +350,10 @@ class TestCleanSchemaFunction:
         schema = get_clean_schema()
         assert isinstance(schema, dict)
         assert "properties" in schema or "$defs" in schema
+
+    def test_get_clean_schema_built_once(self):
+        """Test that the schema is computed once and reused"""
+        assert get_clean_schema() is get_clean_schema()
     
     def test_get_clean_schema_no_titles(self):
         """Test that get_clean_schema removes all title fields"""
@@ -0,0 +1,56 @@
+"""
+Tests for structured logging helpers.
+
+Tests:
+- Request ID propagation from ContextVar
+- JSON rendering of mapping-style log arguments
+"""
+
+import json
+import logging
+
+from app.core.structured_logging import JSONFormatter, RequestContextFilter, request_id_var
+
+
+def _record(msg, args=None):
+    """Build a LogRecord like logger.info(msg, args) would"""
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+
+
+class TestStructuredLogging:
+    """Test request context filter and JSON formatter"""
+
+    def test_filter_attaches_request_id(self):
+        """Records should carry the bound request ID"""
+        token = request_id_var.set("req-123")
+        try:
+            record = _record("hello")
+            RequestContextFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+
+        assert record.request_id == "req-123"
+
+    def test_mapping_args_become_fields(self):
+        """Dict arguments should format the message and appear as JSON fields"""
+        record = _record("time=%(time_ms).1fms", {"time_ms": 12.34, "llm_used": True})
+        RequestContextFilter().filter(record)
+
+        payload = json.loads(JSONFormatter().format(record))
+
+        assert payload["message"] == "time=12.3ms"
+        assert payload["time_ms"] == 12.34
+        assert payload["llm_used"] is True
+        assert payload["request_id"] is None
+
+    def test_mapping_args_do_not_overwrite_reserved_fields(self):
+        """Colliding dict arguments should be prefixed, not replace fields"""
+        record = _record("lvl=%(level)s", {"level": "custom", "message": "spoofed"})
+        RequestContextFilter().filter(record)
+
+        payload = json.loads(JSONFormatter().format(record))
+
+        assert payload["level"] == "INFO"
+        assert payload["message"] == "lvl=custom"
+        assert payload["arg_level"] == "custom"
+        assert payload["arg_message"] == "spoofed"